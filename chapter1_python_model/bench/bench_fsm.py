@@ -0,0 +1,83 @@
+import time
+
+from src.pid import PID
+from src.fsm import AITLState
+from src.aitl_controller import AITLControllerA
+
+
+class _LegacyControllerA:
+    # if/elif 版（テーブル化前）の比較用コピー
+    def __init__(self, pid, llm=None):
+        self.pid = pid
+        self.llm = llm
+        self.state = AITLState.IDLE
+        self.start_cmd = False
+        self.reset_cmd = False
+        self.error_detected = False
+        self.startup_done = False
+        self.setpoint = 0
+        self.measured = 0
+        self.control_output = 0
+
+    def _update_fsm(self):
+        s = self.state
+
+        if s == AITLState.IDLE:
+            if self.start_cmd:
+                self.state = AITLState.STARTUP
+
+        elif s == AITLState.STARTUP:
+            if self.error_detected:
+                self.state = AITLState.FAULT
+            elif self.startup_done:
+                self.state = AITLState.RUN
+
+        elif s == AITLState.RUN:
+            if self.error_detected:
+                self.state = AITLState.FAULT
+
+        elif s == AITLState.FAULT:
+            if self.reset_cmd:
+                self.state = AITLState.IDLE
+
+    def step(self, measured):
+        self.measured = measured
+        self._update_fsm()
+        if self.state in (AITLState.STARTUP, AITLState.RUN):
+            self.control_output = self.pid.update(self.setpoint, measured)
+        else:
+            self.control_output = 0
+        if self.llm:
+            self.llm.adapt(self)
+        return self.control_output
+
+
+def ticks_per_second(cls, n_ticks=200_000, repeat=3):
+    best = 0.0
+    for _ in range(repeat):
+        ctrl = cls(PID(1.0, 0.2, 0.05, 0.01))
+        ctrl.setpoint = 1.0
+        ctrl.start_cmd = True
+        ctrl.startup_done = True
+        step = ctrl.step
+        x = 0.0
+
+        t0 = time.perf_counter()
+        for _ in range(n_ticks):
+            x += step(x) * 0.01
+        elapsed = time.perf_counter() - t0
+
+        best = max(best, n_ticks / elapsed)
+    return best
+
+
+def main():
+    before = ticks_per_second(_LegacyControllerA)
+    after = ticks_per_second(AITLControllerA)
+    print(f"if/elif FSM : {before:12,.0f} ticks/s")
+    print(f"table FSM   : {after:12,.0f} ticks/s")
+    print(f"speedup     : {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.pid import PID
+from src.aitl_controller import AITLControllerA
+from src.llm_placeholder import LLMAdaptiveLayer
+from src.async_adaptive import AsyncAdaptiveLayer, Decision
+from src.batch_controller import BatchAITLController
+from src.instrumentation import instrument
+from src.scenario import FAULT_SCHEDULE, run_scenario
+
+RESULTS = os.path.join(os.path.dirname(__file__), "results.jsonl")
+
+
+def _best_rate(run, n, repeat):
+    # run() performs n ticks; returns the best ticks/s over `repeat` runs
+    best = 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = max(best, n / (time.perf_counter() - t0))
+    return best
+
+
+def _controller(llm=None):
+    ctrl = AITLControllerA(PID(1.0, 0.2, 0.05, 0.01), llm)
+    ctrl.setpoint = 1.0
+    ctrl.start_cmd = True
+    ctrl.startup_done = True
+    return ctrl
+
+
+def _closed_loop(make, n):
+    def run():
+        ctrl = make()
+        step = ctrl.step
+        x = 0.0
+        for _ in range(n):
+            x += step(x) * 0.01
+        if hasattr(ctrl.llm, "close"):
+            ctrl.llm.close()
+    return run
+
+
+def bench_controller(n, repeat):
+    return _best_rate(_closed_loop(_controller, n), n, repeat)
+
+
+def bench_controller_instrumented(n, repeat):
+    return _best_rate(
+        _closed_loop(lambda: instrument(_controller(), dt=0.01), n), n, repeat
+    )
+
+
+def bench_adapt_placeholder(n, repeat):
+    return _best_rate(
+        _closed_loop(lambda: _controller(LLMAdaptiveLayer()), n), n, repeat
+    )
+
+
+def bench_adapt_async(n, repeat):
+    def model(snap):
+        time.sleep(0.001)  # stand-in for inference latency
+        return Decision(kp=snap.kp)
+
+    return _best_rate(
+        _closed_loop(lambda: _controller(AsyncAdaptiveLayer(model)), n), n, repeat
+    )
+
+
+def bench_scenario(n, repeat):
+    def run():
+        ctrl = AITLControllerA(PID(1.0, 0.2, 0.05, 0.01))
+        ctrl.setpoint = 1.0
+        run_scenario(ctrl, n, FAULT_SCHEDULE)
+    return _best_rate(run, n, repeat)
+
+
+def bench_batch_1000(n, repeat):
+    loops = 1000
+    ticks = max(n // loops, 10)
+
+    def run():
+        b = BatchAITLController(np.linspace(0.5, 2.0, loops), 0.2, 0.05, 0.01)
+        b.setpoint[:] = 1.0
+        b.start_cmd[:] = True
+        b.startup_done[:] = True
+        x = np.zeros(loops)
+        for _ in range(ticks):
+            x = x + b.step(x) * 0.01
+
+    # loop-ticks per second
+    return _best_rate(run, ticks * loops, repeat)
+
+
+BENCHMARKS = {
+    "controller_step": bench_controller,
+    "controller_step_instrumented": bench_controller_instrumented,
+    "adapt_placeholder": bench_adapt_placeholder,
+    "adapt_async": bench_adapt_async,
+    "scenario_fault": bench_scenario,
+    "batch_1000_loops": bench_batch_1000,
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous(path, machine):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path) as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("machine") == machine:
+                last = rec
+    return last
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AITL control-loop benchmarks")
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--results", default=RESULTS)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if any benchmark regressed")
+    args = parser.parse_args()
+
+    machine = platform.node()
+    prev = _previous(args.results, machine)
+    results = {}
+    regressions = []
+
+    print(f"{'benchmark':30s} {'ticks/s':>14s} {'vs prev':>9s}")
+    for name, bench in BENCHMARKS.items():
+        rate = bench(args.ticks, args.repeat)
+        results[name] = rate
+
+        delta = ""
+        if prev and name in prev["results"]:
+            change = rate / prev["results"][name] - 1.0
+            delta = f"{change:+8.1%}"
+            if change < -args.threshold:
+                regressions.append(name)
+                delta += " !"
+        print(f"{name:30s} {rate:14,.0f} {delta:>9s}")
+
+    if prev:
+        print(f"[INFO] compared with {prev.get('commit')} ({prev['time']})")
+
+    if not args.no_save:
+        rec = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "machine": machine,
+            "python": platform.python_version(),
+            "ticks": args.ticks,
+            "results": results,
+        }
+        with open(args.results, "a") as f:
+            f.write(json.dumps(rec) + "\n")
+        print(f"[INFO] Saved results to: {args.results}")
+
+    if regressions:
+        print(f"[WARN] regressions: {', '.join(regressions)}")
+        if args.check:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
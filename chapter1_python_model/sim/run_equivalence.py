@@ -0,0 +1,53 @@
+import argparse
+import os
+import time
+
+from src.equivalence import (
+    CANNED_VCD,
+    compare_vcd,
+    run_rtl,
+    write_stimulus,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Level-1 Python <-> RTL trace equivalence for fsm_rtl.sv"
+    )
+    parser.add_argument("--cycles", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--p-fault", type=float, default=0.05)
+    parser.add_argument("--vcd", help="compare an existing VCD instead of simulating")
+    args = parser.parse_args()
+
+    vcd = args.vcd
+    if vcd is None:
+        os.makedirs("build", exist_ok=True)
+        stim = os.path.join("build", "stim.txt")
+        write_stimulus(stim, args.cycles, seed=args.seed, p_fault=args.p_fault)
+        try:
+            vcd = run_rtl(stim)
+        except FileNotFoundError:
+            vcd = CANNED_VCD
+            print(f"[WARN] iverilog not found, using canned VCD: {vcd}")
+
+    t0 = time.perf_counter()
+    res = compare_vcd(vcd)
+    elapsed = time.perf_counter() - t0
+
+    print(f"[INFO] {res.cycles:,} cycles compared in {elapsed:.2f} s")
+    if res.mismatch is None:
+        print("[PASS] state_q / outputs match the Python golden model")
+    else:
+        m = res.mismatch
+        # inputs is -1 when in_start / in_done / in_fault holds x or z
+        inputs = "xxx" if m.inputs < 0 else f"{m.inputs:03b}"
+        print(
+            f"[FAIL] cycle {m.cycle}: {m.field} expected={m.expected} "
+            f"actual={m.actual} inputs={inputs}"
+        )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from datetime import datetime
 from src.pid import PID
 from src.aitl_controller import AITLControllerA
 from src.llm_placeholder import LLMAdaptiveLayer
+from src.scenario import FAULT_SCHEDULE, run_scenario
+from src.trace_store import TraceStore, TraceWriter
 
 
 def simulate_fault():
@@ -14,40 +16,30 @@ def simulate_fault():
     ctrl = AITLControllerA(pid, LLMAdaptiveLayer())
     ctrl.setpoint = 1.0
 
-    x = 0
-    xs, us, states = [], [], []
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    for t in range(300):
-        if t == 10:
-            ctrl.start_cmd = True
-        if t == 30:
-            ctrl.startup_done = True
-        if t == 120:
-            ctrl.error_detected = True
-        if t == 200:
-            ctrl.reset_cmd = True
+    # ====== Run (streamed into a trace store) ======
+    tracedir = f"traces/fault_scenario_{timestamp}"
+    with TraceWriter(tracedir) as w:
+        run_scenario(ctrl, 300, FAULT_SCHEDULE, writer=w)
 
-        u = ctrl.step(x)
-        x += u * dt
+    print(f"[INFO] Saved trace to: {tracedir}")
 
-        xs.append(x)
-        us.append(u)
-        states.append(ctrl.state.value)
+    store = TraceStore(tracedir)
 
     # ====== Plot ======
     fig, ax1 = plt.subplots()
-    ax1.plot(xs, "b-", label="x(t)")
+    ax1.plot(store.x, "b-", label="x(t)")
     ax1.set_ylabel("x(t)", color="b")
 
     ax2 = ax1.twinx()
-    ax2.plot(states, "r--", label="state")
+    ax2.plot(store.states(), "r--", label="state")
     ax2.set_ylabel("state", color="r")
 
     plt.title("AITL Fault Scenario")
 
     # ====== Save ======
     os.makedirs("plots", exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"plots/fault_scenario_{timestamp}.png"
     plt.savefig(filename, dpi=200)
 
@@ -6,6 +6,12 @@ from datetime import datetime
 from src.pid import PID
 from src.aitl_controller import AITLControllerA
 from src.llm_placeholder import LLMAdaptiveLayer
+from src.scenario import Event, run_scenario
+
+STEP_SCHEDULE = [
+    Event(0, "start_cmd", True),
+    Event(0, "startup_done", True),
+]
 
 
 def simulate():
@@ -17,18 +23,7 @@ def simulate():
     ctrl = AITLControllerA(pid, LLMAdaptiveLayer())
     ctrl.setpoint = 1.0
 
-    ctrl.start_cmd = True
-    ctrl.startup_done = True
-
-    x = 0
-    xs, us = [], []
-
-    for _ in range(N):
-        u = ctrl.step(x)
-        x += u * dt  # simple plant model
-
-        xs.append(x)
-        us.append(u)
+    xs, us, _ = run_scenario(ctrl, N, STEP_SCHEDULE)  # plant: x += u * dt
 
     # ====== Plot ======
     plt.figure()
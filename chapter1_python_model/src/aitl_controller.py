@@ -1,51 +1,90 @@
-from .fsm import AITLState
+from .fsm import (
+    AITLState,
+    ACTIVE,
+    INPUT_BITS,
+    NEXT_STATE,
+    STATE_BY_VALUE,
+    START_CMD,
+    STARTUP_DONE,
+    ERROR_DETECTED,
+    RESET_CMD,
+)
+
+
+def _input_flag(bit):
+    def fget(self):
+        return bool(self._inputs & bit)
+
+    def fset(self, value):
+        if value:
+            self._inputs |= bit
+        else:
+            self._inputs &= ~bit
+
+    return property(fget, fset)
+
 
 class AITLControllerA:
+    __slots__ = (
+        "pid",
+        "llm",
+        "_state",
+        "_inputs",
+        "setpoint",
+        "measured",
+        "control_output",
+    )
+
     def __init__(self, pid, llm=None):
         self.pid = pid
         self.llm = llm
-        self.state = AITLState.IDLE
+        self._state = AITLState.IDLE.value
 
-        # external signals
-        self.start_cmd = False
-        self.reset_cmd = False
-       	self.error_detected = False
-        self.startup_done = False
+        # external signals（packed into self._inputs）
+        self._inputs = 0
 
         # control variables
         self.setpoint = 0
         self.measured = 0
         self.control_output = 0
 
-    def _update_fsm(self):
-        s = self.state
+    start_cmd = _input_flag(START_CMD)
+    startup_done = _input_flag(STARTUP_DONE)
+    error_detected = _input_flag(ERROR_DETECTED)
+    reset_cmd = _input_flag(RESET_CMD)
 
-        if s == AITLState.IDLE:
-            if self.start_cmd:
-                self.state = AITLState.STARTUP
+    @property
+    def state(self):
+        return STATE_BY_VALUE[self._state]
 
-        elif s == AITLState.STARTUP:
-            if self.error_detected:
-                self.state = AITLState.FAULT
-            elif self.startup_done:
-                self.state = AITLState.RUN
+    @state.setter
+    def state(self, value):
+        self._state = value.value
 
-        elif s == AITLState.RUN:
-            if self.error_detected:
-                self.state = AITLState.FAULT
+    def output_pinned(self):
+        """
+        True if, with the current inputs, every further step() returns 0
+        and leaves the state unchanged (IDLE / FAULT waiting for a command).
+        """
+        s = self._state
+        return (
+            not ACTIVE[s]
+            and NEXT_STATE[(s << INPUT_BITS) | self._inputs] == s
+            and (self.llm is None or getattr(self.llm, "passive", False))
+        )
 
-        elif s == AITLState.FAULT:
-            if self.reset_cmd:
-                self.state = AITLState.IDLE
+    def _update_fsm(self):
+        self._state = NEXT_STATE[(self._state << INPUT_BITS) | self._inputs]
 
     def step(self, measured):
         self.measured = measured
 
-        # FSM
-        self._update_fsm()
+        # FSM（テーブル参照 1 回）
+        s = NEXT_STATE[(self._state << INPUT_BITS) | self._inputs]
+        self._state = s
 
         # PID動作は STARTUP/RUN のときのみ
-        if self.state in (AITLState.STARTUP, AITLState.RUN):
+        if ACTIVE[s]:
             self.control_output = self.pid.update(self.setpoint, measured)
         else:
             self.control_output = 0
@@ -0,0 +1,137 @@
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# what the model sees / returns; None fields in a Decision mean "unchanged"
+Snapshot = namedtuple(
+    "Snapshot", ["tick", "state", "error", "trend", "kp", "ki", "kd", "setpoint"]
+)
+Decision = namedtuple("Decision", ["kp", "ki", "kd", "setpoint"], defaults=(None,) * 4)
+
+
+class AsyncAdaptiveLayer:
+    """
+    Non-blocking AITL Layer-3.
+
+    Drop-in for LLMAdaptiveLayer: AITLControllerA.step calls adapt() at the
+    end of every tick. adapt() never waits on the model. It hands a
+    snapshot to a background executor, and applies a finished decision
+    at the next tick boundary. Requests are rate limited to one per
+    `interval` ticks. At most one runs at a time, and newer snapshots
+    replace a queued one (coalescing). Decisions are cached in an LRU
+    keyed on the quantized (state, error, trend) signature.
+
+    model(snapshot) -> Decision | None runs on the executor thread and
+    must not touch the controller.
+    """
+
+    def __init__(self, model, interval=10, error_quantum=0.05, trend_quantum=0.01,
+                 cache_size=256, max_age=None, executor=None):
+        self.model = model
+        self.interval = interval
+        self.error_quantum = error_quantum
+        self.trend_quantum = trend_quantum
+        self.cache_size = cache_size
+        self.max_age = max_age
+
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="aitl-adapt"
+        )
+        self._cache = OrderedDict()
+        self._inflight = None  # (signature, snapshot, future)
+        self._queued = None  # (signature, snapshot)
+
+        self.tick = 0
+        self._last_request = None
+        self._last_error = 0.0
+
+        self.stats = dict.fromkeys(
+            ("submitted", "coalesced", "cache_hits", "applied", "stale", "errors"), 0
+        )
+
+    def signature(self, state, error, trend):
+        return (
+            state,
+            round(error / self.error_quantum),
+            round(trend / self.trend_quantum),
+        )
+
+    def adapt(self, controller):
+        self.tick += 1
+        error = controller.setpoint - controller.measured
+        trend = error - self._last_error
+        self._last_error = error
+
+        self._collect(controller)
+
+        if self._last_request is not None and self.tick - self._last_request < self.interval:
+            return None
+        self._last_request = self.tick
+
+        pid = controller.pid
+        sig = self.signature(controller.state, error, trend)
+        snap = Snapshot(self.tick, controller.state, error, trend,
+                        pid.kp, pid.ki, pid.kd, controller.setpoint)
+
+        if sig in self._cache:
+            self._cache.move_to_end(sig)
+            self.stats["cache_hits"] += 1
+            self._apply(controller, self._cache[sig])
+        elif self._inflight is None:
+            self._submit(sig, snap)
+        else:
+            if self._queued is not None:
+                self.stats["coalesced"] += 1
+            self._queued = (sig, snap)
+        return None
+
+    def _submit(self, sig, snap):
+        self._inflight = (sig, snap, self._executor.submit(self.model, snap))
+        self.stats["submitted"] += 1
+
+    def _collect(self, controller):
+        if self._inflight is None or not self._inflight[2].done():
+            return
+
+        sig, snap, future = self._inflight
+        self._inflight = None
+        if future.exception() is not None:
+            self.stats["errors"] += 1
+        else:
+            decision = future.result()
+            self._cache[sig] = decision
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+            if self.max_age is not None and self.tick - snap.tick > self.max_age:
+                self.stats["stale"] += 1
+            else:
+                self._apply(controller, decision)
+
+        if self._queued is not None:
+            self._submit(*self._queued)
+            self._queued = None
+
+    def _apply(self, controller, decision):
+        if decision is None:
+            return
+        pid = controller.pid
+        if decision.kp is not None:
+            pid.kp = decision.kp
+        if decision.ki is not None:
+            pid.ki = decision.ki
+        if decision.kd is not None:
+            pid.kd = decision.kd
+        if decision.setpoint is not None:
+            controller.setpoint = decision.setpoint
+        self.stats["applied"] += 1
+
+    def close(self, wait=True):
+        if self._own_executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(wait=False)
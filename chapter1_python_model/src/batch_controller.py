@@ -0,0 +1,111 @@
+import numpy as np
+
+from .fsm import (
+    AITLState,
+    ACTIVE,
+    INPUT_BITS,
+    NEXT_STATE,
+    START_CMD,
+    STARTUP_DONE,
+    ERROR_DETECTED,
+    RESET_CMD,
+)
+
+IDLE = AITLState.IDLE.value
+
+# same transition table as AITLControllerA, as arrays for fancy indexing
+_NEXT_STATE = np.array(NEXT_STATE, dtype=np.int8)
+_ACTIVE = np.array(ACTIVE, dtype=bool)
+
+
+class BatchAITLController:
+    """
+    N independent AITLControllerA + PID loops held as NumPy arrays.
+
+    One step() advances every loop and is bit-for-bit identical to
+    calling AITLControllerA.step / PID.update on each loop in turn.
+    """
+
+    def __init__(self, kp, ki, kd, dt, n=None):
+        if n is None:
+            n = np.broadcast(kp, ki, kd, dt).size
+        self.n = n
+
+        self.kp = np.broadcast_to(np.asarray(kp, dtype=np.float64), (n,)).copy()
+        self.ki = np.broadcast_to(np.asarray(ki, dtype=np.float64), (n,)).copy()
+        self.kd = np.broadcast_to(np.asarray(kd, dtype=np.float64), (n,)).copy()
+        self.dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (n,)).copy()
+        self._integral = np.zeros(n)
+        self._prev = np.zeros(n)
+
+        self.state = np.full(n, IDLE, dtype=np.int8)
+
+        # external signals
+        self.start_cmd = np.zeros(n, dtype=bool)
+        self.reset_cmd = np.zeros(n, dtype=bool)
+        self.error_detected = np.zeros(n, dtype=bool)
+        self.startup_done = np.zeros(n, dtype=bool)
+
+        # control variables
+        self.setpoint = np.zeros(n)
+        self.measured = np.zeros(n)
+        self.control_output = np.zeros(n)
+
+    @classmethod
+    def from_controllers(cls, controllers):
+        """Snapshot a list of AITLControllerA (with float PID) into one batch."""
+        pids = [c.pid for c in controllers]
+        b = cls(
+            [p.kp for p in pids],
+            [p.ki for p in pids],
+            [p.kd for p in pids],
+            [p.dt for p in pids],
+            n=len(controllers),
+        )
+        b._integral[:] = [p._integral for p in pids]
+        b._prev[:] = [p._prev for p in pids]
+        b.state[:] = [c.state.value for c in controllers]
+        b.start_cmd[:] = [c.start_cmd for c in controllers]
+        b.reset_cmd[:] = [c.reset_cmd for c in controllers]
+        b.error_detected[:] = [c.error_detected for c in controllers]
+        b.startup_done[:] = [c.startup_done for c in controllers]
+        b.setpoint[:] = [c.setpoint for c in controllers]
+        b.measured[:] = [c.measured for c in controllers]
+        b.control_output[:] = [c.control_output for c in controllers]
+        return b
+
+    def states(self):
+        return [AITLState(v) for v in self.state]
+
+    def _packed_inputs(self):
+        inputs = self.start_cmd * np.intp(START_CMD)
+        inputs |= self.startup_done * np.intp(STARTUP_DONE)
+        inputs |= self.error_detected * np.intp(ERROR_DETECTED)
+        inputs |= self.reset_cmd * np.intp(RESET_CMD)
+        return inputs
+
+    def _update_fsm(self):
+        idx = (self.state.astype(np.intp) << INPUT_BITS) | self._packed_inputs()
+        self.state = _NEXT_STATE[idx]
+
+    def step(self, measured):
+        measured = np.broadcast_to(np.asarray(measured, dtype=np.float64), (self.n,))
+        self.measured = measured.copy()
+
+        # FSM
+        self._update_fsm()
+
+        # PID動作は STARTUP/RUN のときのみ
+        active = _ACTIVE[self.state]
+
+        # same operation order as PID.update so every lane rounds identically
+        e = self.setpoint - measured
+        integral = self._integral + e * self.dt
+        d = (e - self._prev) / self.dt
+        u = self.kp * e + self.ki * integral + self.kd * d
+
+        self._integral = np.where(active, integral, self._integral)
+        self._prev = np.where(active, e, self._prev)
+        self.control_output = np.where(active, u, 0.0)
+
+        return self.control_output
@@ -0,0 +1,398 @@
+import os
+import shutil
+import subprocess
+from collections import namedtuple
+
+import numpy as np
+
+# Level-1 (state + output trace) equivalence against
+# docs/chapter3/code/rtl/fsm_rtl.sv, see docs/chapter4/04_equivalence_python_verilog.md
+
+RTL_DIR = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "docs", "chapter3", "code"
+))
+CANNED_VCD = os.path.join(RTL_DIR, "sim", "canned", "tb_fsm_min.vcd")
+
+# packed input word, same bit order as the stimulus file (MSB first)
+IN_FAULT = 1 << 0
+IN_DONE = 1 << 1
+IN_START = 1 << 2
+
+INPUT_BITS = 3
+INPUT_SIGNALS = ("in_start", "in_done", "in_fault")
+
+# packed Moore outputs
+OUT_BUSY = 1 << 0
+OUT_ERROR = 1 << 1
+
+# Python golden model of the RTL contract.
+# 遷移規則: (from, mask, value, to) — inputs & mask == value で成立、上から優先
+GOLDEN_STATES = ("IDLE", "RUN", "DONE", "FAULT")
+GOLDEN_RULES = (
+    ("IDLE", IN_START, IN_START, "RUN"),
+    ("RUN", IN_FAULT, IN_FAULT, "FAULT"),
+    ("RUN", IN_DONE, IN_DONE, "DONE"),
+    ("DONE", IN_START, 0, "IDLE"),
+    ("FAULT", IN_FAULT, 0, "IDLE"),
+)
+GOLDEN_OUTPUTS = {"RUN": OUT_BUSY, "FAULT": OUT_ERROR}
+RESET_STATE = "IDLE"
+
+# Python state -> fsm_rtl state_q code (localparam S_*)
+STATE_MAP = {"IDLE": 0, "RUN": 1, "DONE": 2, "FAULT": 3}
+
+Cycles = namedtuple("Cycles", ["rst_n", "inputs", "state_q", "outputs"])
+Mismatch = namedtuple("Mismatch", ["cycle", "field", "expected", "actual", "inputs"])
+EquivalenceResult = namedtuple("EquivalenceResult", ["cycles", "mismatch"])
+
+DEFAULT_CHUNK = 1 << 16
+DEFAULT_BLOCK = 1 << 23
+
+
+def compile_golden(states=GOLDEN_STATES, rules=GOLDEN_RULES,
+                   outputs=GOLDEN_OUTPUTS, state_map=STATE_MAP):
+    """
+    Flatten the golden model into lookup tables.
+
+    Returns (next_state, mapped_state_q, mapped_outputs), where
+    next_state[(s << INPUT_BITS) | inputs] is the next state index.
+    """
+    index = {name: i for i, name in enumerate(states)}
+    next_state = []
+    for s in states:
+        for inputs in range(1 << INPUT_BITS):
+            nxt = index[s]
+            for src, mask, value, dst in rules:
+                if src == s and inputs & mask == value:
+                    nxt = index[dst]
+                    break
+            next_state.append(nxt)
+
+    mapped_q = np.array([state_map[s] for s in states], dtype=np.int16)
+    mapped_out = np.array([outputs.get(s, 0) for s in states], dtype=np.int16)
+    return next_state, mapped_q, mapped_out
+
+
+# ---------------------------------------------------------------- stimulus
+
+def write_stimulus(path, n_cycles, seed=0, p_start=0.5, p_done=0.5,
+                   p_fault=0.05, chunk=DEFAULT_CHUNK):
+    """
+    Write n_cycles random input vectors, one "<start><done><fault>" line each.
+
+    Each input is an independent Bernoulli(p_*) draw per cycle; pass 0 or 1
+    to pin a signal for constrained runs. Written in chunks, so the file
+    size is not limited by memory.
+    """
+    rng = np.random.default_rng(seed)
+    p = np.array([p_start, p_done, p_fault])
+    with open(path, "wb") as f:
+        for lo in range(0, n_cycles, chunk):
+            k = min(chunk, n_cycles - lo)
+            lines = np.empty((k, INPUT_BITS + 1), dtype=np.uint8)
+            lines[:, :INPUT_BITS] = (rng.random((k, INPUT_BITS)) < p) + ord("0")
+            lines[:, INPUT_BITS] = ord("\n")
+            lines.tofile(f)
+
+
+def read_stimulus(path, chunk=DEFAULT_CHUNK):
+    """Yield packed input words from a stimulus file, chunk by chunk."""
+    weights = np.array([1 << (INPUT_BITS - 1 - i) for i in range(INPUT_BITS)],
+                       dtype=np.uint8)
+    line = INPUT_BITS + 1
+    with open(path, "rb") as f:
+        while True:
+            raw = np.fromfile(f, dtype=np.uint8, count=chunk * line)
+            if raw.size == 0:
+                return
+            bits = raw.reshape(-1, line)[:, :INPUT_BITS] - ord("0")
+            yield (bits @ weights).astype(np.uint8)
+
+
+# ------------------------------------------------------------ golden model
+
+def run_golden(inputs, rst_n=None, state=0, tables=None):
+    """
+    Step the golden model over a block of packed inputs.
+
+    Returns (state indices after each edge, final state). Cycles with
+    rst_n != 1 force the reset state. Instead of a per-cycle loop, each
+    cycle is treated as a map state -> next state and the maps are
+    composed with a log2(n)-pass prefix scan.
+    """
+    next_state, _, _ = tables or compile_golden()
+    n = len(inputs)
+    if n == 0:
+        return np.empty(0, dtype=np.int16), state
+
+    table = np.asarray(next_state, dtype=np.int8).reshape(-1, 1 << INPUT_BITS)
+    f = table[:, np.asarray(inputs, dtype=np.intp) & ((1 << INPUT_BITS) - 1)].T.copy()
+    if rst_n is not None:
+        f[np.asarray(rst_n) != 1] = GOLDEN_STATES.index(RESET_STATE)
+
+    # f[t] <- f[t] o f[t - shift] until f[t] = f[t] o ... o f[0]
+    n_states = f.shape[1]
+    row = np.arange(n, dtype=np.intp)[:, None] * n_states
+    shift = 1
+    while shift < n:
+        f[shift:] = f.ravel()[row[shift:] + f[:-shift]]
+        shift *= 2
+
+    trace = f[:, state].astype(np.int16)
+    return trace, int(trace[-1])
+
+
+# ------------------------------------------------------------- VCD parsing
+
+def _parse_vcd_header(f, top):
+    scope = []
+    ids = {}
+    for line in f:
+        tok = line.split()
+        if not tok:
+            continue
+        if tok[0] == b"$scope":
+            scope.append(tok[2].decode())
+        elif tok[0] == b"$upscope":
+            scope.pop()
+        elif tok[0] == b"$var":
+            name = ".".join(scope + [tok[4].decode()])
+            ids.setdefault(name, tok[3])
+            if top is None:
+                top = scope[0]
+        elif tok[0] == b"$enddefinitions":
+            return ids, top
+    raise ValueError("VCD has no $enddefinitions")
+
+
+def _id_key(ident):
+    return int.from_bytes(ident[:8], "little")
+
+
+def _id_keys(arr, lo, hi):
+    # pack up to 8 identifier bytes per line into one uint64, as _id_key does
+    key = np.zeros(len(lo), dtype=np.uint64)
+    for j in range(min(8, int((hi - lo).max(initial=0)))):
+        pos = lo + j
+        ok = pos < hi
+        byte = arr[np.where(ok, pos, 0)].astype(np.uint64)
+        key |= np.where(ok, byte, 0).astype(np.uint64) << np.uint64(8 * j)
+    return key
+
+
+def _vcd_blocks(f, block):
+    # split the body on timestep boundaries so no timestep spans two blocks
+    carry = b""
+    while True:
+        data = f.read(block)
+        if not data:
+            if carry:
+                yield carry
+            return
+        buf = carry + data
+        cut = buf.rfind(b"\n#")
+        if cut < 0:
+            carry = buf
+            continue
+        yield buf[:cut + 1]
+        carry = buf[cut + 1:]
+
+
+# scalar value change lines: '0' / '1' / x / z (anything else: not a scalar)
+_SCALAR = np.full(256, -2, dtype=np.int8)
+_SCALAR[ord("0")] = 0
+_SCALAR[ord("1")] = 1
+for _c in b"xXzZ":
+    _SCALAR[_c] = -1
+
+
+def _parse_values(arr, lo, hi):
+    # binary vector digits arr[lo:hi] -> int, -1 if any x/z
+    n = hi - lo
+    val = np.zeros(len(lo), dtype=np.int64)
+    bad = np.zeros(len(lo), dtype=bool)
+    for j in range(int(n.max(initial=0))):
+        m = j < n
+        d = arr[np.where(m, lo + j, 0)].astype(np.int64) - 48
+        bad |= m & ((d < 0) | (d > 1))
+        val = np.where(m, val * 2 + d, val)
+    val[bad] = -1
+    return val
+
+
+def iter_vcd(path, top=None, clock="clk", reset="rst_n", block=DEFAULT_BLOCK):
+    """
+    Stream a VCD dumped from the fsm_rtl testbench as Cycles chunks.
+
+    One sample is taken per rising clock edge, after all value changes of
+    that timestep (so state_q / outputs are the post-edge values and the
+    inputs are the ones consumed by the edge). The body is tokenized with
+    NumPy `block` bytes at a time, so memory use stays constant whatever
+    the file size. Unknown (x/z) values read as -1.
+    """
+    with open(path, "rb") as f:
+        ids, top = _parse_vcd_header(f, top)
+
+        def ident(name):
+            full = f"{top}.{name}"
+            if full not in ids:
+                raise KeyError(f"{full} not found in {path}")
+            return ids[full]
+
+        # slot 0 is the clock
+        names = (clock, reset) + INPUT_SIGNALS + ("state_q", "out_busy", "out_error")
+        key_slot = {_id_key(ident(n)): k for k, n in enumerate(names)}
+        known = np.array(sorted(key_slot), dtype=np.uint64)
+        known_slot = np.array([key_slot[k] for k in sorted(key_slot)])
+        last = np.full(len(names), -1, dtype=np.int64)
+
+        for buf in _vcd_blocks(f, block):
+            arr = np.frombuffer(buf, dtype=np.uint8)
+            ends = np.flatnonzero(arr == 10)
+            if arr[-1] != 10:
+                ends = np.append(ends, len(arr))
+            starts = np.empty_like(ends)
+            starts[0] = 0
+            starts[1:] = ends[:-1] + 1
+            keep = ends > starts
+            starts, ends = starts[keep], ends[keep]
+            ends = ends - (arr[ends - 1] == 13)  # CRLF
+
+            first = arr[starts]
+            step = np.cumsum(first == 35)  # timestep of every line
+
+            scal = np.flatnonzero(_SCALAR[first] > -2)
+            vec = np.flatnonzero((first == 98) | (first == 66))
+            spaces = np.flatnonzero(arr == 32)
+            vsp = spaces[np.searchsorted(spaces, starts[vec])] if len(vec) else vec
+
+            lines = np.concatenate([scal, vec])
+            keys = _id_keys(
+                arr,
+                np.concatenate([starts[scal] + 1, vsp + 1]),
+                np.concatenate([ends[scal], ends[vec]]),
+            )
+            pos = np.minimum(np.searchsorted(known, keys), len(known) - 1)
+            hit = known[pos] == keys
+
+            values = np.concatenate([
+                _SCALAR[first[scal]].astype(np.int64),
+                np.zeros(len(vec), dtype=np.int64),
+            ])
+            is_vec = np.arange(len(lines)) >= len(scal)
+            pv = np.flatnonzero(hit & is_vec)
+            values[pv] = _parse_values(
+                arr, starts[lines[pv]] + 1, vsp[pv - len(scal)]
+            )
+
+            # value-change events of the watched signals, in file order
+            order = np.argsort(lines[hit], kind="stable")
+            ev_line = lines[hit][order]
+            ev_slot = known_slot[pos[hit]][order]
+            ev_val = values[hit][order]
+            ev_step = step[ev_line]
+
+            per_slot = []
+            for k in range(len(names)):
+                m = ev_slot == k
+                per_slot.append((ev_step[m], ev_val[m]))
+
+            clk_step, clk_val = per_slot[0]
+            prev = np.concatenate([last[:1], clk_val[:-1]])
+            rise = clk_step[(clk_val == 1) & (prev == 0)]
+            edges = rise[np.r_[True, rise[1:] != rise[:-1]]] if len(rise) else rise
+
+            sample = []
+            for k, (ts, vs) in enumerate(per_slot):
+                idx = np.searchsorted(ts, edges, side="right") - 1
+                sample.append(
+                    np.where(idx >= 0, vs[np.maximum(idx, 0)] if len(vs) else 0,
+                             last[k])
+                )
+                if len(vs):
+                    last[k] = vs[-1]
+
+            if not len(edges):
+                continue
+            _, r, s, d, e, q, b, er = sample
+            unknown_in = (s < 0) | (d < 0) | (e < 0)
+            unknown_out = (b < 0) | (er < 0)
+            yield Cycles(
+                r.astype(np.int16),
+                np.where(unknown_in, -1, (s << 2) | (d << 1) | e).astype(np.int16),
+                q.astype(np.int16),
+                np.where(unknown_out, -1, b | (er << 1)).astype(np.int16),
+            )
+
+
+# -------------------------------------------------------------- comparison
+
+def compare_vcd(path, top=None, block=DEFAULT_BLOCK, tables=None):
+    """
+    Check a VCD cycle by cycle against the golden model.
+
+    The golden model is driven with the inputs recorded in the VCD, and its
+    state / outputs are mapped through STATE_MAP / GOLDEN_OUTPUTS. Stops at
+    the first mismatching cycle (cycles in reset are not compared).
+    """
+    tables = tables or compile_golden()
+    _, mapped_q, mapped_out = tables
+    state = GOLDEN_STATES.index(RESET_STATE)
+    base = 0
+
+    for cyc in iter_vcd(path, top=top, block=block):
+        active = cyc.rst_n == 1
+        bad_in = active & (cyc.inputs < 0)
+        if bad_in.any():
+            i = int(bad_in.argmax())
+            return EquivalenceResult(
+                base + i + 1, Mismatch(base + i, "inputs", None, -1, -1)
+            )
+
+        st, state = run_golden(cyc.inputs, cyc.rst_n, state, tables)
+        exp_q = mapped_q[st]
+        exp_out = mapped_out[st]
+
+        wrong_q = active & (cyc.state_q != exp_q)
+        wrong_out = active & (cyc.outputs != exp_out)
+        wrong = wrong_q | wrong_out
+        if wrong.any():
+            i = int(wrong.argmax())
+            if wrong_q[i]:
+                m = Mismatch(base + i, "state_q", int(exp_q[i]),
+                             int(cyc.state_q[i]), int(cyc.inputs[i]))
+            else:
+                m = Mismatch(base + i, "outputs", int(exp_out[i]),
+                             int(cyc.outputs[i]), int(cyc.inputs[i]))
+            return EquivalenceResult(base + i + 1, m)
+
+        base += len(cyc.inputs)
+
+    return EquivalenceResult(base, None)
+
+
+# ------------------------------------------------------------ RTL simulation
+
+def run_rtl(stim_path, build_dir=None):
+    """Simulate fsm_rtl.sv with tb_fsm_stim.sv on stim_path; returns the VCD path."""
+    if shutil.which("iverilog") is None or shutil.which("vvp") is None:
+        raise FileNotFoundError("iverilog / vvp not found on PATH")
+
+    sim_dir = os.path.join(RTL_DIR, "sim")
+    build_dir = build_dir or os.path.join(sim_dir, "build")
+    os.makedirs(build_dir, exist_ok=True)
+    out = os.path.join(build_dir, "tb_stim.out")
+    vcd = os.path.join(build_dir, "wave_stim.vcd")
+
+    subprocess.run(
+        ["iverilog", "-g2012", "-o", out,
+         os.path.join(RTL_DIR, "rtl", "fsm_rtl.sv"),
+         os.path.join(RTL_DIR, "tb", "tb_fsm_stim.sv")],
+        check=True,
+    )
+    subprocess.run(
+        ["vvp", out, f"+STIM={os.path.abspath(stim_path)}",
+         f"+VCD={os.path.abspath(vcd)}"],
+        check=True, cwd=build_dir, stdout=subprocess.DEVNULL,
+    )
+    return vcd
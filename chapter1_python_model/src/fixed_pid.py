@@ -0,0 +1,180 @@
+from collections import namedtuple
+
+import numpy as np
+
+ROUNDING = ("floor", "nearest", "convergent")
+OVERFLOW = ("saturate", "wrap")
+
+# where range checks happen, in datapath order
+SITES = ("input", "error", "integral", "derivative", "output")
+
+
+class QFormat(namedtuple("QFormat", ["int_bits", "frac_bits"])):
+    """Signed Qm.n: 1 sign bit + m integer bits + n fractional bits."""
+
+    @property
+    def bits(self):
+        return 1 + self.int_bits + self.frac_bits
+
+
+def shift_round(v, shift, mode):
+    """v / 2**shift rounded to an integer (arithmetic right shift with rounding)."""
+    if shift == 0:
+        return v
+    if mode == "floor":
+        return v >> shift
+    half = np.int64(1) << (shift - 1)
+    if mode == "nearest":
+        return (v + half) >> shift
+    q = v >> shift
+    rem = v & ((half << 1) - 1)
+    return q + ((rem > half) | ((rem == half) & (q & 1 == 1)))
+
+
+def quantize(x, frac_bits, mode):
+    """Float -> integer with frac_bits fractional bits (not range-checked)."""
+    v = np.asarray(x, dtype=np.float64) * (1 << frac_bits)
+    if mode == "floor":
+        v = np.floor(v)
+    elif mode == "nearest":
+        v = np.floor(v + 0.5)
+    else:
+        v = np.rint(v)
+    return np.clip(v, -(2.0 ** 62), 2.0 ** 62).astype(np.int64)
+
+
+def fit(v, bits, mode):
+    """Bring v into a signed `bits`-wide register; returns (value, out_of_range)."""
+    lo = -(np.int64(1) << (bits - 1))
+    hi = -lo - 1
+    over = (v < lo) | (v > hi)
+    if mode == "saturate":
+        return np.clip(v, lo, hi), over
+    mask = (np.int64(1) << bits) - 1
+    return ((v - lo) & mask) + lo, over
+
+
+class FixedPointPID:
+    """
+    Bit-accurate fixed-point model of PID.update for the RTL datapath.
+
+    Every register is a signed integer in Q format `q` (the integrator in
+    `acc_bits`), products are rounded back to q.frac_bits before summing,
+    and each register write is either saturated or wrapped. All state is
+    held in int64 arrays of length n, so one update() advances n loops.
+    overflows / saturations count out-of-range and clamped writes per site
+    and per loop.
+
+    Drop-in for PID: scalar update(sp, x) returns a float.
+    """
+
+    def __init__(self, kp, ki, kd, dt, n=None, q=QFormat(11, 16),
+                 acc_bits=None, rounding="nearest", overflow="saturate"):
+        if rounding not in ROUNDING:
+            raise ValueError(f"rounding must be one of {ROUNDING}")
+        if overflow not in OVERFLOW:
+            raise ValueError(f"overflow must be one of {OVERFLOW}")
+        # every product must fit in int64 before it is shifted back
+        if q.bits > 31 or (acc_bits or q.bits) + q.bits > 64:
+            raise ValueError("need q.bits <= 31 and acc_bits + q.bits <= 64")
+
+        if n is None:
+            n = np.broadcast(kp, ki, kd, dt).size
+        self.n = n
+        self.dt = dt
+        self.q = q
+        self.acc_bits = acc_bits or q.bits
+        self.rounding = rounding
+        self.overflow = overflow
+
+        f = q.frac_bits
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self._dt = self._const(dt)
+        self._inv_dt = self._const(1.0 / np.asarray(dt, dtype=np.float64))
+        self._scale = 1.0 / (1 << f)
+
+        self._integral = np.zeros(n, dtype=np.int64)
+        self._prev = np.zeros(n, dtype=np.int64)
+        self.reset_counters()
+
+    # gains are re-quantized when assigned, e.g. by an adaptive layer
+    def _gain(name):
+        def fget(self):
+            return getattr(self, "_" + name + "_value")
+
+        def fset(self, value):
+            setattr(self, "_" + name + "_value", value)
+            setattr(self, "_" + name, self._const(value))
+
+        return property(fget, fset)
+
+    kp = _gain("kp")
+    ki = _gain("ki")
+    kd = _gain("kd")
+    del _gain
+
+    def _const(self, value):
+        v = quantize(value, self.q.frac_bits, self.rounding)
+        v, over = fit(v, self.q.bits, "saturate")
+        if over.any():
+            raise ValueError(f"constant {value} does not fit in {self.q}")
+        return np.broadcast_to(v, (self.n,)).copy()
+
+    def reset_counters(self):
+        self.overflows = {s: np.zeros(self.n, dtype=np.int64) for s in SITES}
+        self.saturations = {s: np.zeros(self.n, dtype=np.int64) for s in SITES}
+
+    def _fit(self, v, site, bits=None):
+        v, over = fit(v, bits or self.q.bits, self.overflow)
+        if over.ndim > 1:
+            over = over.sum(axis=0)
+        self.overflows[site] += over
+        if self.overflow == "saturate":
+            self.saturations[site] += over
+        return v
+
+    def _mul(self, a, b):
+        return shift_round(a * b, self.q.frac_bits, self.rounding)
+
+    def to_fixed(self, x):
+        return self._fit(quantize(x, self.q.frac_bits, self.rounding), "input")
+
+    def update_fixed(self, sp, x):
+        """One tick on raw Q-format integers; returns the raw output register."""
+        e = self._fit(sp - x, "error")
+        self._integral = self._fit(
+            self._integral + self._mul(e, self._dt), "integral", self.acc_bits
+        )
+        d = self._fit(self._mul(e - self._prev, self._inv_dt), "derivative")
+        self._prev = e
+        u = (
+            self._mul(self._kp, e)
+            + self._mul(self._ki, self._integral)
+            + self._mul(self._kd, d)
+        )
+        return self._fit(u, "output")
+
+    def update(self, sp, x):
+        scalar = np.ndim(sp) == 0 and np.ndim(x) == 0
+        sp_q = self.to_fixed(np.broadcast_to(sp, (self.n,)))
+        x_q = self.to_fixed(np.broadcast_to(x, (self.n,)))
+        u = self.update_fixed(sp_q, x_q) * self._scale
+        return float(u[0]) if scalar and self.n == 1 else u
+
+    def run(self, sp, xs):
+        """
+        Open-loop trace: xs is (T, n) measurements, or (T,) / (T, 1) fed to
+        every loop. Returns u as (T, n); with n == 1, u has the shape of xs.
+        Time runs in one loop; loops are vectorized.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        shape = xs.shape if self.n == 1 else (len(xs), self.n)
+        x_q = self.to_fixed(
+            np.broadcast_to(xs.reshape(len(xs), -1), (len(xs), self.n))
+        )
+        sp_q = self.to_fixed(np.broadcast_to(sp, (self.n,)))
+
+        out = np.empty((len(xs), self.n), dtype=np.int64)
+        for t in range(len(xs)):
+            out[t] = self.update_fixed(sp_q, x_q[t])
+        return (out * self._scale).reshape(shape)
@@ -5,3 +5,66 @@ class AITLState(Enum):
     STARTUP = auto()
     RUN = auto()
     FAULT = auto()
+
+
+# 入力ビット（packed input word）
+START_CMD = 1 << 0
+STARTUP_DONE = 1 << 1
+ERROR_DETECTED = 1 << 2
+RESET_CMD = 1 << 3
+
+INPUT_BITS = 4
+INPUT_MASK = (1 << INPUT_BITS) - 1
+
+# 遷移規則: (from, input bit, to)
+# 同じ from の規則は上から優先。どれにも当たらなければ状態保持。
+TRANSITION_RULES = (
+    (AITLState.IDLE, START_CMD, AITLState.STARTUP),
+    (AITLState.STARTUP, ERROR_DETECTED, AITLState.FAULT),
+    (AITLState.STARTUP, STARTUP_DONE, AITLState.RUN),
+    (AITLState.RUN, ERROR_DETECTED, AITLState.FAULT),
+    (AITLState.FAULT, RESET_CMD, AITLState.IDLE),
+)
+
+# PID が動作する状態
+ACTIVE_STATES = (AITLState.STARTUP, AITLState.RUN)
+
+
+def pack_inputs(start_cmd, startup_done, error_detected, reset_cmd):
+    return (
+        (START_CMD if start_cmd else 0)
+        | (STARTUP_DONE if startup_done else 0)
+        | (ERROR_DETECTED if error_detected else 0)
+        | (RESET_CMD if reset_cmd else 0)
+    )
+
+
+def _build_tables():
+    n_rows = max(s.value for s in AITLState) + 1
+
+    # row = state.value, column = packed inputs; row 0 is unused
+    next_state = []
+    for code in range(n_rows):
+        for inputs in range(1 << INPUT_BITS):
+            nxt = code
+            for src, bit, dst in TRANSITION_RULES:
+                if src.value == code and inputs & bit:
+                    nxt = dst.value
+                    break
+            next_state.append(nxt)
+
+    active = tuple(
+        any(s.value == code for s in ACTIVE_STATES) for code in range(n_rows)
+    )
+    states = tuple(
+        AITLState(code) if code else None for code in range(n_rows)
+    )
+    return tuple(next_state), active, states
+
+
+# NEXT_STATE[(state.value << INPUT_BITS) | inputs] -> next state.value
+NEXT_STATE, ACTIVE, STATE_BY_VALUE = _build_tables()
+
+
+def next_state(state, inputs):
+    return STATE_BY_VALUE[NEXT_STATE[(state.value << INPUT_BITS) | inputs]]
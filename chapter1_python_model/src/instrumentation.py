@@ -0,0 +1,176 @@
+from time import perf_counter_ns
+
+from .aitl_controller import AITLControllerA
+from .fsm import STATE_BY_VALUE
+
+# log2 buckets: bucket k holds latencies in [2**(k-1), 2**k) ns
+N_BUCKETS = 64
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "n", "total", "total_sq", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.n = 0
+        self.total = 0
+        self.total_sq = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[ns.bit_length()] += 1
+        self.n += 1
+        self.total += ns
+        self.total_sq += ns * ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def jitter(self):
+        """Standard deviation of the latency, in ns."""
+        if self.n < 2:
+            return 0.0
+        var = (self.total_sq - self.total * self.total / self.n) / (self.n - 1)
+        return max(var, 0.0) ** 0.5
+
+    def percentile(self, p):
+        """Upper bound (ns) of the bucket holding the p-th percentile."""
+        if not self.n:
+            return 0
+        rank = p / 100.0 * self.n
+        seen = 0
+        for k, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(1 << k, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.n,
+            "mean_ns": self.mean(),
+            "jitter_ns": self.jitter(),
+            "min_ns": self.min or 0,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+        }
+
+
+class LoopProbe:
+    """
+    Timing counters for one control loop.
+
+    step / pid / adapt are latency histograms; state_ticks counts ticks
+    ending in each AITLState; deadline_misses counts steps slower than dt.
+    """
+
+    def __init__(self, dt=None):
+        self.step = LatencyHistogram()
+        self.pid = LatencyHistogram()
+        self.adapt = LatencyHistogram()
+        self.state_ticks = [0] * len(STATE_BY_VALUE)
+        self.deadline_ns = int(dt * 1e9) if dt else None
+        self.deadline_misses = 0
+
+    def summary(self):
+        return {
+            "step": self.step.summary(),
+            "pid": self.pid.summary(),
+            "adapt": self.adapt.summary(),
+            "state_ticks": {
+                s.name: self.state_ticks[s.value]
+                for s in STATE_BY_VALUE if s is not None
+            },
+            "deadline_ns": self.deadline_ns,
+            "deadline_misses": self.deadline_misses,
+        }
+
+
+class _Timed:
+    # attribute passthrough wrapper timing one method of the wrapped object
+    __slots__ = ("_target", "_hist")
+
+    def __init__(self, target, hist):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_hist", hist)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __bool__(self):
+        return bool(self._target)
+
+
+class _TimedPID(_Timed):
+    __slots__ = ()
+
+    def update(self, sp, x):
+        t0 = perf_counter_ns()
+        u = self._target.update(sp, x)
+        self._hist.record(perf_counter_ns() - t0)
+        return u
+
+
+class _TimedLayer(_Timed):
+    __slots__ = ()
+
+    def adapt(self, controller):
+        t0 = perf_counter_ns()
+        r = self._target.adapt(controller)
+        self._hist.record(perf_counter_ns() - t0)
+        return r
+
+
+class InstrumentedControllerA(AITLControllerA):
+    """AITLControllerA that times step / PID.update / adapt into self.probe."""
+
+    __slots__ = ("probe",)
+
+    def step(self, measured):
+        t0 = perf_counter_ns()
+        u = AITLControllerA.step(self, measured)
+        ns = perf_counter_ns() - t0
+
+        probe = self.probe
+        probe.step.record(ns)
+        probe.state_ticks[self._state] += 1
+        if probe.deadline_ns is not None and ns > probe.deadline_ns:
+            probe.deadline_misses += 1
+        return u
+
+    def output_pinned(self):
+        # every tick must go through step() to be timed and counted, so
+        # run_scenario(fast_forward=True) never coasts an instrumented loop
+        return False
+
+
+def instrument(ctrl, dt=None):
+    """
+    Return an instrumented copy of ctrl sharing its pid / llm objects.
+
+    The plain controller is left untouched, so loops that are not
+    instrumented pay nothing. FSM state, inputs and control variables are
+    copied, not shared: step only the returned controller afterwards
+    (ctrl = instrument(ctrl)). dt (s) is the per-step deadline.
+    """
+    probe = LoopProbe(dt)
+    inst = InstrumentedControllerA(
+        _TimedPID(ctrl.pid, probe.pid),
+        _TimedLayer(ctrl.llm, probe.adapt) if ctrl.llm else None,
+    )
+    inst._state = ctrl._state
+    inst._inputs = ctrl._inputs
+    inst.setpoint = ctrl.setpoint
+    inst.measured = ctrl.measured
+    inst.control_output = ctrl.control_output
+    inst.probe = probe
+    return inst
@@ -4,6 +4,9 @@ class LLMAdaptiveLayer:
     Adaptive logic will be added in later chapters.
     """
 
+    # adapt() has no effect, so runners may skip ticks without calling it
+    passive = True
+
     def adapt(self, controller):
         # Not implemented in Chapter 1
         return None
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def expm(M):
+    """
+    Matrix exponential: [6/6] Padé approximant with scaling and squaring
+    (Golub & Van Loan, Alg. 11.3.1). Accepts a stack (..., n, n).
+    """
+    M = np.asarray(M, dtype=np.float64)
+    n = M.shape[-1]
+    norm = np.abs(M).sum(axis=-1).max() if M.size else 0.0
+    s = max(0, int(np.ceil(np.log2(norm / 0.5)))) if norm > 0.5 else 0
+    A = M / (1 << s)
+
+    eye = np.broadcast_to(np.eye(n), M.shape)
+    q = 6
+    c = 0.5
+    X = A
+    N = eye + c * A
+    D = eye - c * A
+    for k in range(2, q + 1):
+        c = c * (q - k + 1) / (k * (2 * q - k + 1))
+        X = A @ X
+        N = N + c * X
+        D = D + c * X if k % 2 == 0 else D - c * X
+
+    E = np.linalg.solve(D, N)
+    for _ in range(s):
+        E = E @ E
+    return E
+
+
+def discretize(A, B, dt):
+    """Zero-order-hold discretization: Ad = e^(A dt), Bd = int_0^dt e^(A s) ds B."""
+    A = np.asarray(A, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    n, m = A.shape[-1], B.shape[-1]
+    batch = np.broadcast_shapes(A.shape[:-2], B.shape[:-2])
+
+    M = np.zeros(batch + (n + m, n + m))
+    M[..., :n, :n] = A
+    M[..., :n, n:] = B
+    E = expm(M * dt)
+    return E[..., :n, :n], E[..., :n, n:]
+
+
+class StateSpacePlant:
+    """
+    Linear plant x[k+1] = Ad x[k] + Bd u[k], y[k] = C x[k].
+
+    Built from continuous (A, B, C) with exact ZOH discretization over dt,
+    or from discrete matrices with from_discrete(). With n_plants set, x
+    holds one state vector per plant; A / B / C may then be shared
+    (2-D) or given per plant (3-D), and step() takes one input per plant.
+
+    Usable as run_scenario's plant: plant(y, u) steps and returns y.
+    coast(k) / advance(k) jump over k zero-input ticks in O(log k) NumPy
+    operations, which run_scenario(fast_forward=True) uses for spans
+    where the controller output is pinned to 0.
+    """
+
+    def __init__(self, A, B, C, dt, x0=None, n_plants=None):
+        Ad, Bd = discretize(np.atleast_2d(A), np.atleast_2d(B), dt)
+        self._init(Ad, Bd, C, x0, n_plants)
+        self.dt = dt
+
+    @classmethod
+    def from_discrete(cls, Ad, Bd, C, x0=None, n_plants=None):
+        plant = cls.__new__(cls)
+        plant._init(np.atleast_2d(Ad), np.atleast_2d(Bd), C, x0, n_plants)
+        plant.dt = None
+        return plant
+
+    def _init(self, Ad, Bd, C, x0, n_plants):
+        self.Ad = np.asarray(Ad, dtype=np.float64)
+        self.Bd = np.asarray(Bd, dtype=np.float64)
+        self.C = np.atleast_2d(np.asarray(C, dtype=np.float64))
+        self.n_states = self.Ad.shape[-1]
+        self.n_inputs = self.Bd.shape[-1]
+        self.n_outputs = self.C.shape[-2]
+        self.batched = n_plants is not None
+
+        shape = (n_plants or 1, self.n_states)
+        self.x = np.zeros(shape)
+        if x0 is not None:
+            self.x[:] = x0
+
+        # scalar fast path for unbatched first-order SISO plants
+        self._scalar = (
+            not self.batched and self.Ad.shape == (1, 1)
+            and self.Bd.shape == (1, 1) and self.C.shape == (1, 1)
+        )
+        if self._scalar:
+            self._ad = float(self.Ad[0, 0])
+            self._bd = float(self.Bd[0, 0])
+            self._c = float(self.C[0, 0])
+
+    def _out(self, x):
+        # x: (..., N, n) -> SISO: (..., N) / MIMO: (..., N, p), batch axis dropped if unbatched
+        y = (self.C @ x[..., None])[..., 0]
+        if self.n_outputs == 1:
+            y = y[..., 0]
+        if not self.batched:
+            y = y[..., 0] if self.n_outputs == 1 else y[..., 0, :]
+            if np.ndim(y) == 0:
+                return float(y)
+        return y
+
+    def output(self):
+        return self._out(self.x)
+
+    def step(self, u):
+        if self._scalar:
+            v = self._ad * float(self.x[0, 0]) + self._bd * u
+            self.x[0, 0] = v
+            return self._c * v
+        u = np.asarray(u, dtype=np.float64).reshape(-1, self.n_inputs)
+        self.x = (self.Ad @ self.x[..., None])[..., 0] + (self.Bd @ u[..., None])[..., 0]
+        return self.output()
+
+    def __call__(self, y, u):
+        return self.step(u)
+
+    def advance(self, k):
+        """Jump k zero-input ticks; returns the output after the jump."""
+        if k > 0:
+            P = np.linalg.matrix_power(self.Ad, k)
+            self.x = (P @ self.x[..., None])[..., 0]
+        return self.output()
+
+    def coast(self, k):
+        """Outputs of the next k zero-input ticks (leading axis k); advances x."""
+        X = np.empty((k,) + self.x.shape)
+        if k == 0:
+            return self._out(X)
+
+        # X[L + i] = Ad^L X[i]: fill by doubling the covered span
+        X[0] = (self.Ad @ self.x[..., None])[..., 0]
+        done = 1
+        P = self.Ad
+        while done < k:
+            take = min(done, k - done)
+            X[done:done + take] = (P @ X[:take, ..., None])[..., 0]
+            done += take
+            P = P @ P
+        self.x = X[-1].copy()
+        return self._out(X)
+
+
+def integrator_plant(gain, dt, x0=0.0):
+    """x[k+1] = x[k] + gain * dt * u[k] as a state-space plant."""
+    return StateSpacePlant([[0.0]], [[gain]], [[1.0]], dt, x0=x0)
+
+
+def first_order_plant(tau, gain, dt, x0=0.0):
+    """tau * dy/dt = -y + gain * u."""
+    return StateSpacePlant([[-1.0 / tau]], [[gain / tau]], [[1.0]], dt, x0=x0)
@@ -0,0 +1,213 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .fsm import AITLState
+
+# (tick, signal name, value) — applied just before ctrl.step() of that tick
+Event = namedtuple("Event", ["tick", "signal", "value"])
+
+Trace = namedtuple("Trace", ["x", "u", "state"])
+
+SIGNALS = ("start_cmd", "startup_done", "error_detected", "reset_cmd", "setpoint")
+
+DEFAULT_CHUNK = 1 << 16
+
+# start, startup done, fault while running, reset (sims, benchmarks, tests)
+FAULT_SCHEDULE = (
+    Event(10, "start_cmd", True),
+    Event(30, "startup_done", True),
+    Event(120, "error_detected", True),
+    Event(200, "reset_cmd", True),
+)
+
+
+def fault_recovery_schedule(reset=200, restart=None):
+    """
+    FAULT_SCHEDULE with a clean recovery: the fault and start_cmd are
+    cleared at `reset` and reset_cmd is released one tick later, so the
+    FSM settles in IDLE; start_cmd is raised again at `restart` if given.
+    """
+    events = list(FAULT_SCHEDULE[:3]) + [
+        Event(reset, "start_cmd", False),
+        Event(reset, "error_detected", False),
+        Event(reset, "reset_cmd", True),
+        Event(reset + 1, "reset_cmd", False),
+    ]
+    if restart is not None:
+        events.append(Event(restart, "start_cmd", True))
+    return events
+
+
+def integrator(gain):
+    """Plant x[k+1] = x[k] + gain * u[k] (the inline model used by the sims)."""
+
+    def plant(x, u):
+        return x + u * gain
+
+    return plant
+
+
+def _check_schedule(events):
+    events = [Event(*e) for e in events]
+    for prev, cur in zip(events, events[1:]):
+        if cur.tick < prev.tick:
+            raise ValueError(f"event schedule not sorted at tick {cur.tick}")
+    for e in events:
+        if e.signal not in SIGNALS:
+            raise ValueError(f"unknown controller signal: {e.signal!r}")
+    return events
+
+
+def _allocate(n_steps, out_dir):
+    if out_dir is None:
+        return Trace(
+            np.empty(n_steps, dtype=np.float64),
+            np.empty(n_steps, dtype=np.float64),
+            np.empty(n_steps, dtype=np.int8),
+        )
+
+    os.makedirs(out_dir, exist_ok=True)
+    return Trace(
+        open_memmap(os.path.join(out_dir, "x.npy"), "w+", np.float64, (n_steps,)),
+        open_memmap(os.path.join(out_dir, "u.npy"), "w+", np.float64, (n_steps,)),
+        open_memmap(os.path.join(out_dir, "state.npy"), "w+", np.int8, (n_steps,)),
+    )
+
+
+def _ticks(ctrl, plant, x, t0, t1, base, xs, us, ss):
+    # step ticks [t0, t1) into the staging buffers; returns the last x
+    step = ctrl.step
+    for t in range(t0, t1):
+        u = step(x)
+        x = plant(x, u)
+
+        i = t - base
+        xs[i] = x
+        us[i] = u
+        ss[i] = ctrl.state.value
+    return x
+
+
+def _coast(ctrl, plant, x, t0, t1, base, xs, us, ss):
+    # ticks [t0, t1) with the output pinned to 0: plant only, in bulk
+    k = t1 - t0
+    ys = plant.coast(k)
+    i = t0 - base
+    xs[i:i + k] = np.asarray(ys, dtype=np.float64).tolist()
+    us[i:i + k] = [0.0] * k
+    ss[i:i + k] = [ctrl.state.value] * k
+
+    # leave the controller as k step() calls would have
+    ctrl.measured = float(ys[-2]) if k > 1 else x
+    ctrl.control_output = 0
+    return float(ys[-1])
+
+
+def run_scenario(ctrl, n_steps, events=(), plant=None, x0=None,
+                 out_dir=None, chunk=DEFAULT_CHUNK, writer=None,
+                 fast_forward=False):
+    """
+    Step ctrl for n_steps ticks, applying the sorted event schedule.
+
+    x/u/state are written into preallocated arrays. With out_dir set they
+    go to memory-mapped x.npy / u.npy / state.npy instead, flushed every
+    `chunk` ticks, so the run is never held in RAM as a whole. With a
+    trace_store.TraceWriter as writer, chunks are appended to it instead
+    and nothing is returned.
+
+    With fast_forward=True, spans where the controller output is pinned
+    to 0 (ctrl.output_pinned()) and no event fires are not stepped tick
+    by tick; the plant jumps over them with plant.coast(k), e.g. a
+    single-output, unbatched plant.StateSpacePlant. This pays off when
+    the schedule parks the FSM in IDLE / FAULT; inputs that keep it
+    cycling (e.g. FAULT_SCHEDULE after the reset) are stepped normally.
+    Instrumented controllers are always stepped tick by tick.
+
+    x0 is the first measurement; for a plant with output() it defaults
+    to (and must match) plant.output(), otherwise to 0.0.
+    """
+    events = _check_schedule(events)
+    if plant is None:
+        plant = integrator(ctrl.pid.dt)
+    if fast_forward:
+        if not hasattr(plant, "coast"):
+            raise ValueError("fast_forward needs a plant with coast(k)")
+        if getattr(plant, "n_outputs", 1) != 1 or getattr(plant, "batched", False):
+            raise ValueError("fast_forward needs a single-output, unbatched plant")
+
+    if hasattr(plant, "output"):
+        y0 = plant.output()
+        if x0 is None:
+            x0 = y0
+        elif not np.array_equal(x0, y0):
+            raise ValueError(f"x0={x0!r} does not match plant.output()={y0!r}")
+    elif x0 is None:
+        x0 = 0.0
+
+    trace = None if writer is not None else _allocate(n_steps, out_dir)
+
+    # fixed-size staging buffers: list item assignment is far cheaper per
+    # tick than NumPy scalar assignment, and each chunk is copied in bulk
+    xs = [0.0] * chunk
+    us = [0.0] * chunk
+    ss = [0] * chunk
+
+    x = x0
+    ev = 0
+    n_ev = len(events)
+
+    for base in range(0, n_steps, chunk):
+        end = min(base + chunk, n_steps)
+        t = base
+
+        while t < end:
+            while ev < n_ev and events[ev].tick <= t:
+                setattr(ctrl, events[ev].signal, events[ev].value)
+                ev += 1
+
+            # run uninterrupted up to the next event or the chunk end
+            stop = end if ev == n_ev else min(end, events[ev].tick)
+
+            if fast_forward:
+                # inputs are fixed until `stop`: within len(AITLState) ticks
+                # the FSM either settles or is cycling; coast only if it
+                # settled with the output pinned
+                for _ in range(min(len(AITLState), stop - t)):
+                    if ctrl.output_pinned():
+                        break
+                    s = ctrl.state
+                    x = _ticks(ctrl, plant, x, t, t + 1, base, xs, us, ss)
+                    t += 1
+                    if ctrl.state is s:
+                        break
+                if t < stop and ctrl.output_pinned():
+                    x = _coast(ctrl, plant, x, t, stop, base, xs, us, ss)
+                    t = stop
+
+            x = _ticks(ctrl, plant, x, t, stop, base, xs, us, ss)
+            t = stop
+
+        k = end - base
+        if writer is not None:
+            writer.append_block(xs[:k], us[:k], ss[:k])
+            continue
+
+        trace.x[base:end] = xs[:k]
+        trace.u[base:end] = us[:k]
+        trace.state[base:end] = ss[:k]
+
+        if out_dir is not None:
+            for arr in trace:
+                arr.flush()
+
+    return trace
+
+
+def load_trace(out_dir, mmap_mode="r"):
+    return Trace(*(
+        np.load(os.path.join(out_dir, name), mmap_mode=mmap_mode)
+        for name in ("x.npy", "u.npy", "state.npy")
+    ))
@@ -0,0 +1,268 @@
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .batch_controller import BatchAITLController
+
+# params columns
+PARAMS = ("kp", "ki", "kd", "plant_gain", "fault_tick")
+# metrics columns
+METRICS = ("rise_time", "overshoot", "settling_time", "iae")
+
+SweepResult = namedtuple("SweepResult", ["params", "metrics", "traces"])
+
+# worker-side views of the result buffers, set up by _attach()
+_buffers = {}
+_handles = []
+
+
+def gain_grid(kp, ki, kd):
+    """Cartesian product of gain values as an (N, 3) array."""
+    grid = np.meshgrid(kp, ki, kd, indexing="ij")
+    return np.stack([g.ravel() for g in grid], axis=1).astype(np.float64)
+
+
+def sample_params(gains, seed=0, plant_spread=0.0, fault_window=None):
+    """
+    Attach Monte Carlo draws to each gain point.
+
+    plant_gain ~ U(1 - plant_spread, 1 + plant_spread); fault_tick is drawn
+    from [lo, hi) when fault_window is given, otherwise -1 (no fault).
+    Everything comes from one seeded generator, so the table is identical
+    however the points are later split across workers.
+    """
+    gains = np.asarray(gains, dtype=np.float64).reshape(-1, 3)
+    n = len(gains)
+    rng = np.random.default_rng(seed)
+
+    plant_gain = 1.0 + rng.uniform(-plant_spread, plant_spread, n)
+    if fault_window is None:
+        fault_tick = np.full(n, -1.0)
+    else:
+        fault_tick = rng.integers(*fault_window, size=n).astype(np.float64)
+
+    return np.column_stack([gains, plant_gain, fault_tick])
+
+
+def simulate_block(params, n_steps, dt, setpoint):
+    """Step-response runs for a block of points; returns x traces (B, n_steps)."""
+    b = len(params)
+    ctrl = BatchAITLController(params[:, 0], params[:, 1], params[:, 2], dt, n=b)
+    ctrl.setpoint[:] = setpoint
+    ctrl.start_cmd[:] = True
+    ctrl.startup_done[:] = True
+
+    gain = params[:, 3] * dt
+    fault_tick = params[:, 4]
+    has_fault = fault_tick >= 0
+
+    x = np.zeros(b)
+    xs = np.empty((b, n_steps))
+    for t in range(n_steps):
+        ctrl.error_detected = has_fault & (fault_tick <= t)
+        u = ctrl.step(x)
+        x = x + u * gain
+        xs[:, t] = x
+    return xs
+
+
+def step_metrics(xs, setpoint, dt, band=0.02):
+    """Rise time (10-90 %), overshoot (fraction), settling time and IAE per row."""
+    xs = np.atleast_2d(xs)
+    n_steps = xs.shape[1]
+    y = xs / setpoint
+    rows = np.arange(len(xs))
+
+    def first_at_or_above(level):
+        hit = y >= level
+        idx = hit.argmax(axis=1)
+        return np.where(hit[rows, idx], idx, np.nan)
+
+    rise = (first_at_or_above(0.9) - first_at_or_above(0.1)) * dt
+
+    overshoot = np.maximum(y.max(axis=1) - 1.0, 0.0)
+
+    # x[k] is the plant output after tick k, i.e. at time (k + 1) * dt
+    outside = np.abs(y - 1.0) > band
+    last_out = np.where(
+        outside.any(axis=1), n_steps - 1 - outside[:, ::-1].argmax(axis=1), -1
+    )
+    settle = (last_out + 2) * dt
+    settle = np.where(outside[:, -1], np.nan, settle)
+
+    iae = np.abs(setpoint - xs).sum(axis=1) * dt
+
+    return np.column_stack([rise, overshoot, settle, iae])
+
+
+def _attach(spec):
+    for name, (kind, loc, shape, dtype) in spec.items():
+        if kind == "shm":
+            shm = shared_memory.SharedMemory(name=loc)
+            _handles.append(shm)
+            _buffers[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        else:
+            _buffers[name] = np.load(loc, mmap_mode="r+")
+
+
+def _run_block(lo, hi, n_steps, dt, setpoint, trace_every):
+    params = _buffers["params"][lo:hi]
+    xs = simulate_block(params, n_steps, dt, setpoint)
+
+    _buffers["metrics"][lo:hi] = step_metrics(xs, setpoint, dt)
+    if trace_every:
+        _buffers["traces"][lo:hi] = xs[:, ::trace_every]
+    # done is written last so an interrupted block is simply rerun
+    _buffers["done"][lo:hi] = 1
+    return hi - lo
+
+
+def _layout(n, n_steps, trace_every):
+    layout = {
+        "params": ((n, len(PARAMS)), np.float64),
+        "metrics": ((n, len(METRICS)), np.float64),
+        "done": ((n,), np.uint8),
+    }
+    if trace_every:
+        layout["traces"] = ((n, -(-n_steps // trace_every)), np.float64)
+    return layout
+
+
+def _open_files(out_dir, layout, params, config):
+    os.makedirs(out_dir, exist_ok=True)
+    spec, arrays = {}, {}
+
+    params_path = os.path.join(out_dir, "params.npy")
+    config_path = os.path.join(out_dir, "sweep.json")
+    resume = os.path.exists(params_path)
+    if resume:
+        saved = None
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                saved = json.load(f)
+        if saved != config or not np.array_equal(np.load(params_path), params):
+            raise ValueError(f"{out_dir} holds results of a different sweep")
+
+    created = False
+    for name, (shape, dtype) in layout.items():
+        path = os.path.join(out_dir, f"{name}.npy")
+        if resume and os.path.exists(path):
+            arr = open_memmap(path, "r+")
+            if arr.shape != shape:
+                raise ValueError(f"{path}: shape {arr.shape}, expected {shape}")
+        else:
+            arr = open_memmap(path, "w+", dtype, shape)
+            if name == "metrics":
+                arr[:] = np.nan
+            created = True
+        arrays[name] = arr
+        spec[name] = ("file", path, shape, dtype)
+
+    # a missing result array means the done mask can't be trusted
+    if created:
+        arrays["done"][:] = 0
+
+    arrays["params"][:] = params
+    for arr in arrays.values():
+        arr.flush()
+    with open(config_path, "w") as f:
+        json.dump(config, f)
+    return spec, arrays, []
+
+
+def _open_shm(layout, params):
+    spec, arrays, handles = {}, {}, []
+    for name, (shape, dtype) in layout.items():
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        handles.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr[:] = np.nan if name == "metrics" else 0
+        arrays[name] = arr
+        spec[name] = ("shm", shm.name, shape, dtype)
+
+    arrays["params"][:] = params
+    return spec, arrays, handles
+
+
+def _pending_blocks(done, block):
+    n = len(done)
+    return [
+        (lo, min(lo + block, n))
+        for lo in range(0, n, block)
+        if not done[lo:lo + block].all()
+    ]
+
+
+def run_sweep(gains, n_steps=500, dt=0.01, setpoint=1.0, seed=0,
+              plant_spread=0.0, fault_window=None, trace_every=None,
+              workers=None, block=None, out_dir=None):
+    """
+    Run the step-response setup for every (kp, ki, kd) row of gains.
+
+    Points are split into blocks that a process pool simulates with
+    BatchAITLController; each worker writes metrics (and x decimated by
+    trace_every) straight into shared result arrays. With out_dir the
+    arrays are memory-mapped .npy files plus sweep.json (the run config),
+    and rerunning the same sweep only computes blocks that have not
+    finished yet; resuming with a different config raises ValueError.
+    """
+    params = sample_params(gains, seed, plant_spread, fault_window)
+    n = len(params)
+    workers = workers or os.cpu_count() or 1
+    if block is None:
+        block = max(1, min(256, -(-n // (workers * 4))))
+
+    layout = _layout(n, n_steps, trace_every)
+    if out_dir is None:
+        spec, arrays, handles = _open_shm(layout, params)
+    else:
+        config = {
+            "n_steps": int(n_steps),
+            "dt": float(dt),
+            "setpoint": float(setpoint),
+            "trace_every": None if not trace_every else int(trace_every),
+            "seed": None if seed is None else int(seed),
+            "plant_spread": float(plant_spread),
+            "fault_window": (
+                None if fault_window is None else [int(v) for v in fault_window]
+            ),
+        }
+        spec, arrays, handles = _open_files(out_dir, layout, params, config)
+
+    try:
+        todo = _pending_blocks(arrays["done"], block)
+        args = (n_steps, dt, setpoint, trace_every)
+
+        if workers == 1:
+            _attach(spec)
+            for lo, hi in todo:
+                _run_block(lo, hi, *args)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_attach,
+                                     initargs=(spec,)) as pool:
+                futures = [pool.submit(_run_block, lo, hi, *args) for lo, hi in todo]
+                for f in futures:
+                    f.result()
+
+        result = SweepResult(
+            params.copy(),
+            np.array(arrays["metrics"]),
+            np.array(arrays["traces"]) if trace_every else None,
+        )
+    finally:
+        _buffers.clear()
+        for shm in _handles:
+            shm.close()
+        del _handles[:]
+        arrays.clear()
+        for shm in handles:
+            shm.close()
+            shm.unlink()
+
+    return result
@@ -0,0 +1,193 @@
+import json
+import os
+
+import numpy as np
+
+from .fsm import AITLState
+
+# On-disk layout of a trace store directory:
+#   x.bin, u.bin   raw little-endian columns, one value per tick
+#   segments.bin   run-length encoded FSM state, one SEGMENT record per run
+#   meta.json      tick count, column dtype, closed segment count, open run
+SEGMENT = np.dtype([("start", "<i8"), ("stop", "<i8"), ("state", "i1")])
+
+DEFAULT_CHUNK = 1 << 16
+
+
+class TraceWriter:
+    """
+    Append-only writer for x/u/state traces.
+
+    Ticks are buffered and written in chunks; consecutive equal states are
+    folded into [start, stop) segments. meta.json is rewritten on every
+    flush, so a store is readable up to the last flush even if the run
+    is interrupted.
+    """
+
+    def __init__(self, path, dtype=np.float64, chunk=DEFAULT_CHUNK):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.chunk = chunk
+
+        self._x = open(os.path.join(path, "x.bin"), "wb")
+        self._u = open(os.path.join(path, "u.bin"), "wb")
+        self._seg = open(os.path.join(path, "segments.bin"), "wb")
+
+        self._xs, self._us, self._ss = [], [], []
+        self.n = 0
+        self.n_segments = 0
+        self._run_state = None
+        self._run_start = 0
+        # the columns were just truncated: drop any stale meta.json with them
+        self._write_meta()
+
+    def append(self, x, u, state):
+        self._xs.append(x)
+        self._us.append(u)
+        self._ss.append(state)
+        if len(self._xs) >= self.chunk:
+            self.flush()
+
+    def append_block(self, x, u, state):
+        self.flush()
+        self._write(np.asarray(x), np.asarray(u), np.asarray(state, dtype=np.int8))
+        self._write_meta()
+
+    def _write(self, x, u, state):
+        if not len(x):
+            return
+        x.astype(self.dtype).tofile(self._x)
+        u.astype(self.dtype).tofile(self._u)
+
+        if self._run_state is None:
+            self._run_state, self._run_start = int(state[0]), self.n
+
+        # every state change closes the open run [run_start, n + c)
+        change = np.flatnonzero(state[1:] != state[:-1]) + 1
+        if state[0] != self._run_state:
+            change = np.r_[0, change]
+
+        if len(change):
+            seg = np.empty(len(change), dtype=SEGMENT)
+            seg["start"] = np.r_[self._run_start, self.n + change[:-1]]
+            seg["stop"] = self.n + change
+            seg["state"] = np.r_[self._run_state, state[change[:-1]]]
+            seg.tofile(self._seg)
+            self.n_segments += len(seg)
+            self._run_start = self.n + int(change[-1])
+
+        self._run_state = int(state[-1])
+        self.n += len(x)
+
+    def flush(self):
+        if self._xs:
+            self._write(
+                np.array(self._xs, dtype=np.float64),
+                np.array(self._us, dtype=np.float64),
+                np.array(self._ss, dtype=np.int8),
+            )
+            self._xs, self._us, self._ss = [], [], []
+        self._write_meta()
+
+    def _write_meta(self):
+        for f in (self._x, self._u, self._seg):
+            f.flush()
+        meta = {
+            "n": self.n,
+            "dtype": self.dtype.str,
+            "segments": self.n_segments,
+            "open_segment": (
+                None if self._run_state is None
+                else [self._run_start, self._run_state]
+            ),
+            "states": {s.name: s.value for s in AITLState},
+        }
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        self.flush()
+        for f in (self._x, self._u, self._seg):
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceStore:
+    """
+    Memory-mapped reader for a TraceWriter directory.
+
+    x / u are np.memmap columns; segments is a SEGMENT array sorted by
+    start, so state lookups and window queries are binary searches and
+    only the touched pages of x / u are read.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.n = meta["n"]
+        dtype = np.dtype(meta["dtype"])
+
+        def column(name):
+            if self.n == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(os.path.join(path, name), dtype=dtype, mode="r",
+                             shape=(self.n,))
+
+        self.x = column("x.bin")
+        self.u = column("u.bin")
+
+        closed = meta["segments"]
+        seg = np.memmap(os.path.join(path, "segments.bin"), dtype=SEGMENT,
+                        mode="r", shape=(closed,)) if closed else np.empty(0, SEGMENT)
+        if meta["open_segment"] is not None:
+            start, state = meta["open_segment"]
+            tail = np.array([(start, self.n, state)], dtype=SEGMENT)
+            seg = np.concatenate([seg, tail])
+        self.segments = seg
+
+    def __len__(self):
+        return self.n
+
+    def state_at(self, t):
+        i = np.searchsorted(self.segments["start"], t, side="right") - 1
+        return AITLState(int(self.segments["state"][i]))
+
+    def states(self, lo=0, hi=None):
+        """Per-tick state values for ticks [lo, hi), expanded from the segments."""
+        hi = self.n if hi is None else hi
+        seg = self.segments_in(lo, hi)
+        starts = np.maximum(seg["start"], lo)
+        stops = np.minimum(seg["stop"], hi)
+        return np.repeat(seg["state"], stops - starts)
+
+    def segments_in(self, lo, hi):
+        """Segments overlapping ticks [lo, hi)."""
+        first = np.searchsorted(self.segments["stop"], lo, side="right")
+        last = np.searchsorted(self.segments["start"], hi, side="left")
+        return self.segments[first:last]
+
+    def intervals(self, state):
+        """[start, stop) tick intervals spent in `state`."""
+        seg = self.segments[self.segments["state"] == state.value]
+        return np.column_stack([seg["start"], seg["stop"]])
+
+    def window(self, lo, hi):
+        return self.x[lo:hi], self.u[lo:hi], self.states(lo, hi)
+
+    def excursions(self, state, column="x"):
+        """(start, stop, min, max) of `column` within every `state` interval."""
+        data = getattr(self, column)
+        out = []
+        for start, stop in self.intervals(state):
+            part = data[start:stop]
+            out.append((start, stop, part.min(), part.max()))
+        return out
@@ -0,0 +1,19 @@
+import pytest
+
+from src.pid import PID
+from src.aitl_controller import AITLControllerA
+
+
+@pytest.fixture
+def make_ctrl():
+    """Factory for the reference controller: PID(1.0, 0.2, 0.05, 0.01), setpoint 1.0."""
+
+    def make(llm=None, pid=None, running=False):
+        ctrl = AITLControllerA(pid or PID(1.0, 0.2, 0.05, 0.01), llm)
+        ctrl.setpoint = 1.0
+        if running:
+            ctrl.start_cmd = True
+            ctrl.startup_done = True
+        return ctrl
+
+    return make
@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.pid import PID
+from src.aitl_controller import AITLControllerA
+from src.batch_controller import BatchAITLController
+
+
+def _make_fleet(n, rng):
+    kp = rng.uniform(0.5, 2.0, n)
+    ki = rng.uniform(0.0, 1.0, n)
+    kd = rng.uniform(0.0, 0.2, n)
+    dt = rng.choice([0.01, 0.02, 0.005], n)
+    sp = rng.uniform(-5.0, 5.0, n)
+
+    ctrls = []
+    for i in range(n):
+        c = AITLControllerA(PID(kp[i], ki[i], kd[i], dt[i]))
+        c.setpoint = sp[i]
+        ctrls.append(c)
+
+    batch = BatchAITLController(kp, ki, kd, dt)
+    batch.setpoint[:] = sp
+    return ctrls, batch
+
+
+def test_batch_matches_scalar_bit_for_bit():
+    rng = np.random.default_rng(0)
+    n = 64
+    ctrls, batch = _make_fleet(n, rng)
+
+    x_s = np.zeros(n)
+    x_b = np.zeros(n)
+    for t in range(400):
+        flags = rng.random((4, n)) < 0.05
+        for i, c in enumerate(ctrls):
+            c.start_cmd, c.startup_done, c.error_detected, c.reset_cmd = flags[:, i]
+        batch.start_cmd[:] = flags[0]
+        batch.startup_done[:] = flags[1]
+        batch.error_detected[:] = flags[2]
+        batch.reset_cmd[:] = flags[3]
+
+        u_s = np.array([c.step(x_s[i]) for i, c in enumerate(ctrls)], dtype=np.float64)
+        u_b = batch.step(x_b)
+
+        assert np.array_equal(u_s, u_b)
+        assert [c.state for c in ctrls] == batch.states()
+
+        x_s = x_s + u_s * 0.01
+        x_b = x_b + u_b * 0.01
+
+
+def test_from_controllers_snapshot():
+    c = AITLControllerA(PID(1.0, 0.2, 0.05, 0.01))
+    c.setpoint = 1.0
+    c.start_cmd = True
+    c.step(0.0)
+
+    b = BatchAITLController.from_controllers([c])
+    assert b.states() == [c.state]
+    assert b.step([0.1])[0] == c.step(0.1)
@@ -0,0 +1,28 @@
+from src.pid import PID
+from src.fsm import AITLState
+from src.aitl_controller import AITLControllerA
+
+
+def test_output_zero_outside_startup_and_run():
+    ctrl = AITLControllerA(PID(1.0, 0.2, 0.05, 0.01))
+    ctrl.setpoint = 1.0
+
+    assert ctrl.step(0.0) == 0
+    assert ctrl.state == AITLState.IDLE
+
+    ctrl.start_cmd = True
+    assert ctrl.step(0.0) != 0
+    assert ctrl.state == AITLState.STARTUP
+
+    ctrl.error_detected = True
+    assert ctrl.step(0.0) == 0
+    assert ctrl.state == AITLState.FAULT
+
+
+def test_flags_are_plain_attributes():
+    ctrl = AITLControllerA(PID(1.0, 0.0, 0.0, 0.01))
+    ctrl.reset_cmd = True
+    assert ctrl.reset_cmd is True
+    ctrl.reset_cmd = False
+    assert ctrl.reset_cmd is False
+    assert not hasattr(ctrl, "__dict__")
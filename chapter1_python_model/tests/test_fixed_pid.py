@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from src.pid import PID
+from src.fsm import AITLState
+from src.aitl_controller import AITLControllerA
+from src.fixed_pid import FixedPointPID, QFormat, shift_round
+
+
+def test_tracks_float_pid_within_resolution():
+    pid = PID(1.0, 0.2, 0.05, 0.01)
+    fx = FixedPointPID(1.0, 0.2, 0.05, 0.01, q=QFormat(10, 20), acc_bits=33)
+
+    x = 0.0
+    for _ in range(300):
+        u = pid.update(1.0, x)
+        assert abs(fx.update(1.0, x) - u) < 1e-3
+        x += u * 0.01
+    assert not any(c.any() for c in fx.overflows.values())
+
+
+def test_saturation_is_counted():
+    fx = FixedPointPID(4.0, 0.0, 0.0, 0.5, q=QFormat(3, 8))
+    u = fx.update(7.0, -7.0)
+    assert u == pytest.approx(8 - 2 ** -8)
+    assert fx.saturations["error"][0] == 1
+    assert fx.saturations["output"][0] == 1
+
+
+def test_integrator_wraps():
+    fx = FixedPointPID(0.0, 1.0, 0.0, 0.5, q=QFormat(3, 4), overflow="wrap")
+    for _ in range(3):
+        fx.update(6.0, 0.0)
+    # 3 * 6 * 0.5 = 9 wraps to 9 - 16 = -7 in a 8-bit Q3.4 register
+    assert fx._integral[0] / 16 == -7.0
+    assert fx.overflows["integral"][0] == 1
+    assert fx.saturations["integral"][0] == 0
+
+
+def test_rounding_modes():
+    v = np.array([5, 6, 7, -5, -6, -7], dtype=np.int64)  # /4: 1.25 1.5 1.75 ...
+    assert shift_round(v, 2, "floor").tolist() == [1, 1, 1, -2, -2, -2]
+    assert shift_round(v, 2, "nearest").tolist() == [1, 2, 2, -1, -1, -2]
+    assert shift_round(v, 2, "convergent").tolist() == [1, 2, 2, -1, -2, -2]
+
+
+def test_vectorized_trace_matches_per_loop_updates():
+    kp = np.array([0.5, 1.0, 2.0])
+    xs = np.linspace(0.0, 1.5, 200)[:, None] * np.array([1.0, 0.5, -0.2])
+
+    batch = FixedPointPID(kp, 0.3, 0.02, 0.01)
+    u = batch.run(1.0, xs)
+
+    for i in range(3):
+        single = FixedPointPID(kp[i], 0.3, 0.02, 0.01)
+        assert np.array_equal(u[:, i], [single.update(1.0, x) for x in xs[:, i]])
+
+
+def test_1d_trace_is_broadcast_to_every_loop():
+    kp = np.array([0.5, 1.0])
+    xs = np.linspace(0.0, 1.0, 5)
+
+    u = FixedPointPID(kp, 0.3, 0.02, 0.01).run(1.0, xs)
+    assert u.shape == (5, 2)
+    assert np.array_equal(u, FixedPointPID(kp, 0.3, 0.02, 0.01).run(
+        1.0, np.column_stack([xs, xs])))
+    assert np.array_equal(u, FixedPointPID(kp, 0.3, 0.02, 0.01).run(1.0, xs[:, None]))
+    assert FixedPointPID(1.0, 0.3, 0.02, 0.01).run(1.0, xs).shape == (5,)
+
+
+def test_per_loop_dt():
+    dt = np.array([0.01, 0.02])
+    batch = FixedPointPID(1.0, 0.1, 0.01, dt)
+    assert batch.n == 2
+
+    u = batch.run(1.0, np.linspace(0.0, 1.0, 20))
+    for i in range(2):
+        single = FixedPointPID(1.0, 0.1, 0.01, dt[i])
+        assert np.array_equal(u[:, i], single.run(1.0, np.linspace(0.0, 1.0, 20)))
+
+
+def test_drop_in_for_controller():
+    ctrl = AITLControllerA(FixedPointPID(1.0, 0.2, 0.05, 0.01))
+    ctrl.setpoint = 1.0
+    ctrl.start_cmd = True
+    u = ctrl.step(0.0)
+    assert ctrl.state == AITLState.STARTUP
+    assert isinstance(u, float) and u > 0
@@ -0,0 +1,26 @@
+from src.fsm import AITLState, next_state, pack_inputs
+
+
+def _reference(state, start_cmd, startup_done, error_detected, reset_cmd):
+    # docs/chapter1/api.md の遷移規則そのまま
+    if state == AITLState.IDLE:
+        return AITLState.STARTUP if start_cmd else state
+    if state == AITLState.STARTUP:
+        if error_detected:
+            return AITLState.FAULT
+        return AITLState.RUN if startup_done else state
+    if state == AITLState.RUN:
+        return AITLState.FAULT if error_detected else state
+    return AITLState.IDLE if reset_cmd else state
+
+
+def test_table_matches_canonical_rules():
+    for state in AITLState:
+        for bits in range(16):
+            flags = [bool(bits & (1 << i)) for i in range(4)]
+            assert next_state(state, pack_inputs(*flags)) == _reference(state, *flags)
+
+
+def test_error_has_priority_over_startup_done():
+    inputs = pack_inputs(False, True, True, False)
+    assert next_state(AITLState.STARTUP, inputs) == AITLState.FAULT
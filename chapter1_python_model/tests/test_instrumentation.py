@@ -0,0 +1,52 @@
+import time
+
+from src.llm_placeholder import LLMAdaptiveLayer
+from src.instrumentation import LatencyHistogram, instrument
+
+
+def test_instrumented_outputs_match_plain_controller(make_ctrl):
+    plain = make_ctrl(LLMAdaptiveLayer())
+    inst = instrument(make_ctrl(LLMAdaptiveLayer()), dt=0.01)
+
+    x_p = x_i = 0.0
+    for t in range(200):
+        for c in (plain, inst):
+            c.start_cmd = t >= 10
+            c.startup_done = t >= 30
+            c.error_detected = 120 <= t < 150
+            c.reset_cmd = t >= 150
+        u_p, u_i = plain.step(x_p), inst.step(x_i)
+        assert u_p == u_i
+        x_p += u_p * 0.01
+        x_i += u_i * 0.01
+
+    s = inst.probe.summary()
+    assert s["step"]["count"] == 200
+    assert s["adapt"]["count"] == 200
+    assert s["pid"]["count"] == sum(
+        s["state_ticks"][k] for k in ("STARTUP", "RUN")
+    )
+    assert sum(s["state_ticks"].values()) == 200
+    assert s["state_ticks"]["FAULT"] > 0
+
+
+def test_deadline_misses(make_ctrl):
+    class SlowLayer:
+        def adapt(self, controller):
+            time.sleep(0.002)
+
+    inst = instrument(make_ctrl(SlowLayer()), dt=0.001)
+    for _ in range(5):
+        inst.step(0.0)
+    assert inst.probe.deadline_misses == 5
+    assert inst.probe.adapt.percentile(50) >= 1_000_000
+
+
+def test_histogram_stats():
+    h = LatencyHistogram()
+    for ns in (100, 100, 100, 5000):
+        h.record(ns)
+    assert h.min == 100 and h.max == 5000
+    assert h.percentile(50) == 128
+    assert h.percentile(100) == 5000
+    assert h.mean() == 1325
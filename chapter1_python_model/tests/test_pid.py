@@ -0,0 +1,22 @@
+import pytest
+
+from src.pid import PID
+
+
+def test_first_update_matches_formula():
+    pid = PID(kp=1.2, ki=0.5, kd=0.1, dt=0.01)
+    e = 10.0
+    assert pid.update(10.0, 0.0) == pytest.approx(1.2 * e + 0.5 * e * 0.01 + 0.1 * e / 0.01)
+
+
+def test_memory_persists_between_updates():
+    pid = PID(kp=0.0, ki=1.0, kd=0.0, dt=0.5)
+    pid.update(1.0, 0.0)
+    assert pid.update(1.0, 0.0) == pytest.approx(1.0)
+    assert pid._prev == 1.0
+
+
+def test_derivative_uses_previous_error():
+    pid = PID(kp=0.0, ki=0.0, kd=1.0, dt=0.1)
+    pid.update(1.0, 0.0)
+    assert pid.update(1.0, 0.5) == pytest.approx((0.5 - 1.0) / 0.1)
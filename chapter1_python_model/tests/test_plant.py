@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from src.llm_placeholder import LLMAdaptiveLayer
+from src.instrumentation import instrument
+from src.plant import (
+    StateSpacePlant,
+    expm,
+    first_order_plant,
+    integrator_plant,
+)
+from src.scenario import (
+    FAULT_SCHEDULE,
+    fault_recovery_schedule,
+    integrator,
+    run_scenario,
+)
+
+# damped oscillator: y'' + 0.4 y' + 4 y = u
+A2 = [[0.0, 1.0], [-4.0, -0.4]]
+B2 = [[0.0], [1.0]]
+C2 = [[1.0, 0.0]]
+
+# long FAULT span, then a long IDLE span after the reset
+LONG_FAULT = fault_recovery_schedule(reset=3000)
+
+
+def test_expm_diagonal_and_rotation():
+    d = np.diag([-1.0, 0.5, 3.0])
+    assert np.allclose(expm(d), np.diag(np.exp([-1.0, 0.5, 3.0])))
+
+    w = 2.0
+    r = expm([[0.0, w], [-w, 0.0]])
+    c, s = np.cos(w), np.sin(w)
+    assert np.allclose(r, [[c, s], [-s, c]])
+
+
+def test_first_order_matches_analytic():
+    tau, gain, dt = 0.3, 2.0, 0.01
+    p = first_order_plant(tau, gain, dt)
+    a = np.exp(-dt / tau)
+    assert p.Ad[0, 0] == pytest.approx(a)
+    assert p.Bd[0, 0] == pytest.approx(gain * (1 - a))
+
+    y = 0.0
+    for _ in range(200):
+        y = p.step(1.0)
+    assert y == pytest.approx(gain * (1 - a ** 200))
+
+
+def test_integrator_plant_matches_closure():
+    ref = integrator(0.01)
+    p = integrator_plant(1.0, 0.01)
+    x = 0.0
+    for u in np.sin(np.arange(100)):
+        x = ref(x, u)
+        assert p(None, u) == pytest.approx(x)
+
+
+def test_coast_equals_zero_input_steps():
+    p = StateSpacePlant(A2, B2, C2, 0.01, x0=[1.0, -0.5])
+    q = StateSpacePlant(A2, B2, C2, 0.01, x0=[1.0, -0.5])
+
+    ys = q.coast(1000)
+    ref = [p.step(0.0) for _ in range(1000)]
+    assert np.allclose(ys, ref)
+    assert np.allclose(q.x, p.x)
+
+    assert q.advance(37) == pytest.approx([p.step(0.0) for _ in range(37)][-1])
+
+
+def test_batched_plants_match_individual():
+    gains = np.array([0.5, 1.0, 2.0])
+    A = np.array([[[0.0, 1.0], [-4.0 * g, -0.4]] for g in gains])
+    batch = StateSpacePlant(A, B2, C2, 0.01, n_plants=3)
+    single = [StateSpacePlant(a, B2, C2, 0.01) for a in A]
+
+    for k in range(50):
+        u = np.cos(k * 0.1) * gains
+        y = batch.step(u)
+        assert np.allclose(y, [p.step(ui) for p, ui in zip(single, u)])
+
+    assert np.allclose(batch.coast(20)[-1], [p.coast(20)[-1] for p in single])
+
+
+@pytest.mark.parametrize("llm", [None, LLMAdaptiveLayer()])
+def test_fast_forward_matches_tick_by_tick(llm, make_ctrl):
+    def run(fast_forward):
+        ctrl = make_ctrl(llm)
+        plant = StateSpacePlant(A2, B2, C2, 0.01, x0=[0.2, 0.0])
+        trace = run_scenario(ctrl, 6000, LONG_FAULT, plant=plant, chunk=1024,
+                             fast_forward=fast_forward)
+        return trace, ctrl
+
+    ref, ref_ctrl = run(False)
+    ff, ff_ctrl = run(True)
+
+    assert np.array_equal(ff.state, ref.state)
+    assert np.allclose(ff.u, ref.u)
+    assert np.allclose(ff.x, ref.x)
+    assert ff_ctrl.measured == pytest.approx(ref_ctrl.measured)
+
+
+def test_fast_forward_with_cycling_fsm(make_ctrl):
+    # after the reset all four flags stay high: FAULT -> IDLE -> STARTUP -> FAULT
+    def run(fast_forward):
+        plant = StateSpacePlant(A2, B2, C2, 0.01)
+        return run_scenario(make_ctrl(), 2000, FAULT_SCHEDULE, plant=plant,
+                            fast_forward=fast_forward)
+
+    ref, ff = run(False), run(True)
+    assert np.array_equal(ff.state, ref.state)
+    assert np.allclose(ff.x, ref.x)
+
+
+def test_x0_defaults_to_plant_output(make_ctrl):
+    plant = StateSpacePlant(A2, B2, C2, 0.01, x0=[0.2, 0.0])
+    ctrl = make_ctrl()
+    run_scenario(ctrl, 1, plant=plant)
+    assert ctrl.measured == pytest.approx(0.2)
+
+    plant = StateSpacePlant(A2, B2, C2, 0.01, x0=[0.2, 0.0])
+    with pytest.raises(ValueError):
+        run_scenario(make_ctrl(), 1, plant=plant, x0=0.0)
+
+
+def test_fast_forward_needs_coast(make_ctrl):
+    with pytest.raises(ValueError):
+        run_scenario(make_ctrl(), 10, fast_forward=True)
+
+
+@pytest.mark.parametrize("plant", [
+    StateSpacePlant(A2, B2, np.eye(2), 0.01),
+    StateSpacePlant(A2, B2, C2, 0.01, n_plants=3),
+])
+def test_fast_forward_rejects_mimo_and_batched_plants(make_ctrl, plant):
+    with pytest.raises(ValueError):
+        run_scenario(make_ctrl(), 10, plant=plant, fast_forward=True)
+
+
+def test_fast_forward_keeps_instrumented_ticks(make_ctrl):
+    ctrl = instrument(make_ctrl(), dt=0.01)
+    plant = StateSpacePlant(A2, B2, C2, 0.01)
+    run_scenario(ctrl, 5000, LONG_FAULT, plant=plant, fast_forward=True)
+    assert sum(ctrl.probe.state_ticks) == 5000
+    assert ctrl.probe.step.n == 5000
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.scenario import FAULT_SCHEDULE, load_trace, run_scenario
+
+
+def _reference(ctrl, n_steps):
+    x = 0
+    xs, us, states = [], [], []
+    for t in range(n_steps):
+        if t == 10:
+            ctrl.start_cmd = True
+        if t == 30:
+            ctrl.startup_done = True
+        if t == 120:
+            ctrl.error_detected = True
+        if t == 200:
+            ctrl.reset_cmd = True
+        u = ctrl.step(x)
+        x += u * 0.01
+        xs.append(x)
+        us.append(u)
+        states.append(ctrl.state.value)
+    return xs, us, states
+
+
+def test_schedule_matches_inline_checks(make_ctrl):
+    xs, us, states = _reference(make_ctrl(), 300)
+    trace = run_scenario(make_ctrl(), 300, FAULT_SCHEDULE, chunk=64)
+
+    assert np.array_equal(trace.x, xs)
+    assert np.array_equal(trace.u, us)
+    assert np.array_equal(trace.state, states)
+
+
+def test_streaming_to_npy(tmp_path, make_ctrl):
+    xs, _, states = _reference(make_ctrl(), 300)
+    run_scenario(make_ctrl(), 300, FAULT_SCHEDULE, out_dir=tmp_path, chunk=37)
+
+    trace = load_trace(tmp_path)
+    assert isinstance(trace.x, np.memmap)
+    assert np.array_equal(trace.x, xs)
+    assert np.array_equal(trace.state, states)
+
+
+def test_unsorted_schedule_rejected(make_ctrl):
+    with pytest.raises(ValueError):
+        run_scenario(make_ctrl(), 10, FAULT_SCHEDULE[::-1])
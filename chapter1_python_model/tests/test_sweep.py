@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.pid import PID
+from src.aitl_controller import AITLControllerA
+from src.scenario import Event, integrator, run_scenario
+from src.sweep import gain_grid, run_sweep, sample_params, step_metrics
+
+GAINS = gain_grid([0.8, 1.0, 1.5], [0.0, 0.2], [0.0, 0.05])
+
+
+def _scalar_trace(p, n_steps, dt):
+    kp, ki, kd, plant_gain, fault_tick = p
+    ctrl = AITLControllerA(PID(kp, ki, kd, dt))
+    ctrl.setpoint = 1.0
+    events = [Event(0, "start_cmd", True), Event(0, "startup_done", True)]
+    if fault_tick >= 0:
+        events.append(Event(int(fault_tick), "error_detected", True))
+    return run_scenario(ctrl, n_steps, events, plant=integrator(plant_gain * dt)).x
+
+
+def test_parallel_sweep_matches_scalar_runs():
+    res = run_sweep(GAINS, n_steps=300, seed=3, plant_spread=0.2,
+                    fault_window=(150, 250), trace_every=1, workers=2, block=5)
+
+    assert np.array_equal(res.params, sample_params(GAINS, 3, 0.2, (150, 250)))
+    for p, m, tr in zip(res.params, res.metrics, res.traces):
+        xs = _scalar_trace(p, 300, 0.01)
+        assert np.array_equal(tr, xs)
+        np.testing.assert_array_equal(m, step_metrics(xs, 1.0, 0.01)[0])
+
+
+def test_resume_only_reruns_unfinished_blocks(tmp_path):
+    full = run_sweep(GAINS, n_steps=200, seed=1, workers=1, out_dir=tmp_path)
+
+    done = np.load(tmp_path / "done.npy", mmap_mode="r+")
+    metrics = np.load(tmp_path / "metrics.npy", mmap_mode="r+")
+    done[4:] = 0
+    metrics[4:] = np.nan
+    done.flush()
+    metrics.flush()
+    del done, metrics
+
+    resumed = run_sweep(GAINS, n_steps=200, seed=1, workers=2, block=3,
+                        out_dir=tmp_path)
+    np.testing.assert_array_equal(resumed.metrics, full.metrics)
+
+
+def test_resume_rejects_different_config(tmp_path):
+    run_sweep(GAINS, n_steps=200, seed=1, workers=1, out_dir=tmp_path)
+    with pytest.raises(ValueError):
+        run_sweep(GAINS, n_steps=800, seed=1, workers=1, out_dir=tmp_path)
+    with pytest.raises(ValueError):
+        run_sweep(GAINS, n_steps=200, seed=1, trace_every=10, workers=1,
+                  out_dir=tmp_path)
+
+
+def test_step_metrics_on_known_curve():
+    dt = 0.1
+    xs = np.array([0.0, 0.5, 1.0, 1.2, 1.0, 1.0])
+    rise, overshoot, settle, iae = step_metrics(xs, 1.0, dt)[0]
+    assert np.isclose(rise, 0.1)
+    assert np.isclose(overshoot, 0.2)
+    assert np.isclose(settle, 0.5)
+    assert np.isclose(iae, (1.0 + 0.5 + 0.0 + 0.2) * dt)
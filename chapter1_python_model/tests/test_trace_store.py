@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.fsm import AITLState
+from src.scenario import fault_recovery_schedule, run_scenario
+from src.trace_store import TraceStore, TraceWriter
+
+SCHEDULE = fault_recovery_schedule(reset=200, restart=260)
+
+
+def test_scenario_writer_roundtrip(tmp_path, make_ctrl):
+    ref = run_scenario(make_ctrl(), 1000, SCHEDULE)
+    with TraceWriter(tmp_path, dtype=np.float32) as w:
+        run_scenario(make_ctrl(), 1000, SCHEDULE, chunk=64, writer=w)
+
+    store = TraceStore(tmp_path)
+    assert len(store) == 1000
+    assert isinstance(store.x, np.memmap)
+    assert np.array_equal(store.x, ref.x.astype(np.float32))
+    assert np.array_equal(store.states(), ref.state)
+    assert np.array_equal(store.states(95, 433), ref.state[95:433])
+
+    # IDLE, STARTUP, RUN, FAULT, IDLE, STARTUP, RUN
+    assert len(store.segments) == 7
+    assert store.intervals(AITLState.FAULT).tolist() == [[120, 200]]
+    assert store.state_at(199) == AITLState.FAULT
+    assert store.state_at(200) == AITLState.IDLE
+
+    (start, stop, lo, hi), = store.excursions(AITLState.FAULT)
+    fault_x = ref.x[120:200].astype(np.float32)
+    assert (start, stop, lo, hi) == (120, 200, fault_x.min(), fault_x.max())
+
+
+def test_single_tick_appends_and_partial_flush(tmp_path):
+    states = [1, 1, 2, 2, 2, 3, 3, 4, 4, 4, 1]
+    w = TraceWriter(tmp_path, chunk=4)
+    for t, s in enumerate(states):
+        w.append(float(t), -float(t), s)
+
+    # readable up to the last flush before close
+    partial = TraceStore(tmp_path)
+    assert len(partial) == 8
+    assert partial.states().tolist() == states[:8]
+
+    w.close()
+    store = TraceStore(tmp_path)
+    assert store.states().tolist() == states
+    assert store.segments["start"].tolist() == [0, 2, 5, 7, 10]
+    x, u, s = store.window(3, 6)
+    assert x.tolist() == [3.0, 4.0, 5.0]
+    assert s.tolist() == [2, 2, 3]
+
+
+def test_reopening_a_store_resets_it(tmp_path):
+    with TraceWriter(tmp_path) as w:
+        for t in range(10):
+            w.append(float(t), 0.0, 1)
+
+    w = TraceWriter(tmp_path)
+    assert len(TraceStore(tmp_path)) == 0
+    w.append(1.0, 0.0, 2)
+    w.close()
+    assert TraceStore(tmp_path).states().tolist() == [2]
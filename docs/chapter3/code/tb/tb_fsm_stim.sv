@@ -0,0 +1,54 @@
+`timescale 1ns/1ps
+
+// Stimulus-driven testbench for Python <-> RTL trace equivalence.
+// Reads one "<start><done><fault>" vector per line from +STIM=<file>
+// and applies it on the falling edge, so each rising edge consumes
+// exactly one vector.
+
+module tb_fsm_stim;
+  logic clk = 0;
+  always #5 clk = ~clk;
+
+  logic rst_n;
+  logic in_start, in_done, in_fault;
+  logic out_busy, out_error;
+  logic [2:0] state_q;
+
+  logic [2:0] vec;
+  integer fd;
+  string stim_file, vcd_file;
+
+  fsm_rtl dut (
+    .clk, .rst_n,
+    .in_start, .in_done, .in_fault,
+    .out_busy, .out_error,
+    .state_q
+  );
+
+  initial begin
+    if (!$value$plusargs("STIM=%s", stim_file)) stim_file = "build/stim.txt";
+    if (!$value$plusargs("VCD=%s", vcd_file)) vcd_file = "build/wave_stim.vcd";
+
+    fd = $fopen(stim_file, "r");
+    if (fd == 0) begin
+      $display("cannot open %s", stim_file);
+      $finish;
+    end
+
+    $dumpfile(vcd_file);
+    $dumpvars(0, tb_fsm_stim);
+
+    rst_n = 0;
+    in_start = 0; in_done = 0; in_fault = 0;
+    repeat (2) @(negedge clk);
+    rst_n = 1;
+
+    while ($fscanf(fd, "%b\n", vec) == 1) begin
+      {in_start, in_done, in_fault} = vec;
+      @(negedge clk);
+    end
+
+    $fclose(fd);
+    $finish;
+  end
+endmodule